@@ -80,6 +80,57 @@ def main():
         help="Do not write output video; only write detections JSON (faster for eval)",
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="Frames per YOLO predict call (tracking still runs frame by frame); also the TensorRT engine batch",
+    )
+    parser.add_argument(
+        "--vid-stride",
+        type=int,
+        default=1,
+        help="Run detection/tracking on every Nth frame only; the video holds each annotated frame N times",
+    )
+    parser.add_argument(
+        "--decoder",
+        type=str,
+        choices=["opencv", "torchcodec", "decord"],
+        default="opencv",
+        help="Video decoder: opencv (CPU), torchcodec or decord (NVDEC on GPU; need CUDA, else fall back to opencv)",
+    )
+    parser.add_argument(
+        "--encoder",
+        type=str,
+        choices=["opencv", "ffmpeg", "pyav"],
+        default="opencv",
+        help="Video encoder: opencv, ffmpeg (raw pipe via imageio-ffmpeg) or pyav (in-process); "
+        "ffmpeg/pyav use h264_nvenc on the GPU when available",
+    )
+    parser.add_argument(
+        "--gpu-preprocess",
+        action="store_true",
+        help="Letterbox frames on the GPU (one upload per batch) instead of per-frame CPU resizing in ultralytics",
+    )
+    parser.add_argument(
+        "--tensorrt",
+        action="store_true",
+        help="Export the .pt model to a TensorRT engine (cached next to the weights) and run that instead",
+    )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        choices=["fp16", "int8"],
+        default="fp16",
+        help="TensorRT engine precision (with --tensorrt); int8 needs --int8-data for calibration",
+    )
+    parser.add_argument(
+        "--int8-data",
+        type=str,
+        default=None,
+        help="Dataset YAML whose images calibrate the INT8 engine (e.g. the training data.yaml)",
+    )
+
     # Annotator arguments (optional customization)
     parser.add_argument(
         "--ellipse-colors",
@@ -122,6 +173,11 @@ def main():
         ball_nms_threshold=args.ball_nms_threshold,
         iou_threshold=args.iou,
         config=config,
+        use_tensorrt=args.tensorrt,
+        tensorrt_batch=args.batch_size,
+        precision=args.precision,
+        int8_data=args.int8_data,
+        gpu_preprocess=args.gpu_preprocess,
     )
 
     # Process video
@@ -180,6 +236,10 @@ def main():
             reset_tracker=True,
             eval_mode=args.eval_mode,
             write_video=not args.json_only,
+            batch_size=args.batch_size,
+            decoder_backend=args.decoder,
+            vid_stride=args.vid_stride,
+            encoder=args.encoder,
         )
     finally:
         if rotation_tmp and os.path.isfile(rotation_tmp) and source_path == rotation_tmp:
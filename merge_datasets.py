@@ -33,6 +33,14 @@ def main():
         "--max-ball-ratio", type=float, default=0.3, help="Maximum ratio of ball-only images to total (default: 0.3)"
     )
 
+    parser.add_argument(
+        "--link-mode",
+        type=str,
+        choices=["hardlink", "reflink", "copy"],
+        default="hardlink",
+        help="How images are placed in the output: hardlink (default, no bytes copied), reflink, or copy",
+    )
+
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility (default: 42)")
 
     args = parser.parse_args()
@@ -52,6 +60,7 @@ def main():
         test_split=args.test_split,
         seed=args.seed,
         max_ball_only_ratio=args.max_ball_ratio,
+        link_mode=args.link_mode,
     )
 
     print(f"\n✅ Merged dataset created at: {output_path}")
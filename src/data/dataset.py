@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import glob
 import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
+import numpy as np
 import yaml
 
 
@@ -54,45 +57,116 @@ def fix_data_yaml(yaml_path: str, num_classes: int = 4, class_names: list[str] |
         yaml.dump(data, f, default_flow_style=False)
 
 
-def remap_labels(label_dir: str, class_map: dict[int, int]) -> tuple[int, int]:
+def remap_labels(label_dir: str, class_map: dict[int, int], workers: int | None = None) -> tuple[int, int]:
     """
     Remap label class IDs in YOLO format label files.
 
+    Files are processed in parallel across processes; small directories are done inline since
+    pool startup would cost more than it saves.
+
     Args:
         label_dir: Directory containing label files
         class_map: Dictionary mapping old class IDs to new class IDs
+        workers: Number of worker processes (default: one per CPU; 1 = no pool)
 
     Returns:
         Tuple of (remapped_count, removed_count)
     """
-    label_files = glob.glob(f"{label_dir}/*.txt")
-    remapped = 0
-    removed = 0
-
-    for label_file in label_files:
-        with open(label_file) as f:
-            lines = f.readlines()
-
-        new_lines = []
-        for line in lines:
-            parts = line.strip().split()
-            if not parts:
-                continue
-            old_class = int(parts[0])
-            if old_class in class_map:
-                parts[0] = str(class_map[old_class])
-                new_lines.append(" ".join(parts) + "\n")
-
-        if new_lines:
-            with open(label_file, "w") as f:
-                f.writelines(new_lines)
-            remapped += 1
-        else:
-            # Remove empty label file and corresponding image
-            os.remove(label_file)
-            image_file = label_file.replace("/labels/", "/images/").replace(".txt", ".jpg")
-            if os.path.exists(image_file):
-                os.remove(image_file)
-            removed += 1
-
+    if not os.path.isdir(label_dir):
+        return 0, 0
+    # scandir yields names straight from readdir, without glob's pattern matching over every entry
+    with os.scandir(label_dir) as entries:
+        label_files = [e.path for e in entries if e.name.endswith(".txt") and e.is_file()]
+
+    # Lookup table old -> new class ID; -1 marks classes that get dropped
+    lut = np.full(max(class_map, default=-1) + 1, -1, dtype=np.int64)
+    for old_class, new_class in class_map.items():
+        lut[old_class] = new_class
+
+    remap_one = partial(_remap_one, lut=lut, class_map=class_map)
+    chunksize = 64
+    if workers == 1 or len(label_files) <= chunksize:
+        results = [remap_one(label_file) for label_file in label_files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(remap_one, label_files, chunksize=chunksize))
+
+    remapped = sum(r for r, _ in results)
+    removed = sum(r for _, r in results)
     return remapped, removed
+
+
+def _remap_one(label_file: str, lut: np.ndarray, class_map: dict[int, int]) -> tuple[int, int]:
+    """
+    Remap a single label file, deleting it and its image if no labels remain.
+
+    Returns:
+        (1, 0) if the file was remapped, (0, 1) if it was removed
+    """
+    if _remap_label_file(label_file, lut, class_map):
+        return 1, 0
+    # Remove empty label file and corresponding image
+    os.remove(label_file)
+    image_file = label_file.replace("/labels/", "/images/").replace(".txt", ".jpg")
+    if os.path.exists(image_file):
+        os.remove(image_file)
+    return 0, 1
+
+
+def _remap_label_file(label_file: str, lut: np.ndarray, class_map: dict[int, int]) -> bool:
+    """
+    Rewrite one label file with remapped class IDs, dropping rows whose class has no mapping.
+
+    Args:
+        label_file: Path to YOLO label file
+        lut: Old -> new class ID lookup table (-1 = drop)
+        class_map: Same mapping as a dict, used for files that don't parse as a numeric table
+
+    Returns:
+        True if the file still has labels (and was rewritten), False if nothing is left
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # np.loadtxt warns on empty files
+            rows = np.loadtxt(label_file, ndmin=2)
+    except ValueError:
+        # Ragged rows (e.g. polygon labels) don't fit a 2-D array; remap line by line instead
+        return _remap_label_lines(label_file, class_map)
+
+    if rows.size == 0:
+        return False
+
+    old_ids = rows[:, 0].astype(np.int64)
+    new_ids = np.full(len(old_ids), -1, dtype=np.int64)
+    known = (old_ids >= 0) & (old_ids < len(lut))
+    new_ids[known] = lut[old_ids[known]]
+    keep = new_ids >= 0
+    if not keep.any():
+        return False
+
+    rows = rows[keep]
+    rows[:, 0] = new_ids[keep]
+    np.savetxt(label_file, rows, fmt=["%d"] + ["%.6f"] * (rows.shape[1] - 1))
+    return True
+
+
+def _remap_label_lines(label_file: str, class_map: dict[int, int]) -> bool:
+    """Line-by-line fallback for ``_remap_label_file``; same contract."""
+    with open(label_file) as f:
+        lines = f.readlines()
+
+    new_lines = []
+    for line in lines:
+        parts = line.strip().split()
+        if not parts:
+            continue
+        old_class = int(parts[0])
+        if old_class in class_map:
+            parts[0] = str(class_map[old_class])
+            new_lines.append(" ".join(parts) + "\n")
+
+    if not new_lines:
+        return False
+    with open(label_file, "w") as f:
+        f.writelines(new_lines)
+    return True
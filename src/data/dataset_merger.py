@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import os
 import random
 import shutil
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Literal
 
 import yaml
 
+LinkMode = Literal["hardlink", "reflink", "copy"]
+
+_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+
 
 def merge_datasets(
     primary_dataset_path: str,
@@ -19,6 +28,8 @@ def merge_datasets(
     test_split: float = 0.1,
     seed: int = 42,
     max_ball_only_ratio: float = 0.3,
+    link_mode: LinkMode = "hardlink",
+    workers: int = 16,
 ) -> str:
     """
     Merge a ball-only dataset with a full 4-class dataset.
@@ -39,6 +50,12 @@ def merge_datasets(
         test_split: Test split ratio (default: 0.1)
         seed: Random seed for reproducibility
         max_ball_only_ratio: Maximum ratio of ball-only images to total (default: 0.3)
+        link_mode: How images are placed in the output (labels are always copied):
+                   \"hardlink\" — share the source file, no bytes written (default);
+                   \"reflink\" — copy-on-write clone via copy_file_range where the filesystem supports it;
+                   \"copy\" — plain byte copy. Fast modes fall back to copying across filesystems.
+                   Hardlinked images are the same file as the source, so edit them only by replacing.
+        workers: Number of threads used to place images and write labels (default: 16)
 
     Returns:
         Path to merged dataset
@@ -62,12 +79,13 @@ def merge_datasets(
     primary_labels: dict[str, dict[str, Path]] = {}
 
     for split in ["train", "val", "test"]:
-        primary_images[split] = list(Path(primary_dataset_path).glob(f"{split}/images/*"))
-        primary_labels[split] = {}
-        for img_path in primary_images[split]:
-            label_path = img_path.parent.parent / "labels" / (img_path.stem + ".txt")
-            if label_path.exists():
-                primary_labels[split][img_path.name] = label_path
+        primary_images[split] = _list_files(Path(primary_dataset_path) / split / "images")
+        # One listing of the labels dir instead of a stat() per image
+        labels_dir = Path(primary_dataset_path) / split / "labels"
+        label_stems = _label_stems(labels_dir)
+        primary_labels[split] = {
+            img.name: labels_dir / f"{img.stem}.txt" for img in primary_images[split] if img.stem in label_stems
+        }
 
     # Load ball-only dataset
     print("📦 Loading ball-only dataset...")
@@ -83,17 +101,17 @@ def merge_datasets(
 
     ball_images_dir = None
     for path in possible_paths:
-        if path.exists() and any(path.glob("*.jpg")) or any(path.glob("*.png")):
+        if _has_images(path):
             ball_images_dir = path
             break
 
     if ball_images_dir is None:
         raise ValueError(f"Could not find images in ball-only dataset at {ball_only_dataset_path}")
 
-    # Find all images
-    for ext in ["*.jpg", "*.jpeg", "*.png"]:
-        ball_only_images.extend(ball_images_dir.glob(ext))
-        ball_only_images.extend(ball_images_dir.parent.glob(f"**/{ext}"))
+    # Find all images in one walk of the images dir's parent (picks up sibling splits), but never
+    # above the dataset root. Sorted so `seed` reproduces the same sample on any filesystem.
+    search_root = ball_images_dir if ball_images_dir == Path(ball_only_dataset_path) else ball_images_dir.parent
+    ball_only_images = sorted(p for p in search_root.rglob("*") if p.suffix.lower() in _IMAGE_EXTENSIONS)
 
     # Find corresponding labels
     possible_label_dirs = [
@@ -104,14 +122,15 @@ def merge_datasets(
 
     ball_labels_dir = None
     for path in possible_label_dirs:
-        if path.exists() and any(path.glob("*.txt")):
+        ball_label_stems = _label_stems(path)
+        if ball_label_stems:
             ball_labels_dir = path
             break
 
     if ball_labels_dir:
         for img_path in ball_only_images:
-            label_path = ball_labels_dir / (img_path.stem + ".txt")
-            if label_path.exists():
+            if img_path.stem in ball_label_stems:
+                label_path = ball_labels_dir / (img_path.stem + ".txt")
                 # Extract only ball annotations
                 ball_annotations = _extract_ball_annotations(label_path, ball_class_id)
                 if ball_annotations:  # Only keep if has ball annotations
@@ -132,17 +151,21 @@ def merge_datasets(
     # Merge datasets
     print("🔄 Merging datasets...")
 
+    # Collect every file operation first, keyed by destination: the later entry wins, as with the old
+    # sequential copies, and no two threads ever write the same path
+    jobs: dict[Path, Callable[[], object]] = {}
+
     # Copy primary dataset
     for split in ["train", "val", "test"]:
         for img_path in primary_images[split]:
-            # Copy image
-            shutil.copy2(img_path, out_dir / split / "images" / img_path.name)
+            # Link/copy image
+            dst = out_dir / split / "images" / img_path.name
+            jobs[dst] = partial(_place_file, img_path, dst, link_mode)
 
             # Copy label
             if img_path.name in primary_labels[split]:
-                shutil.copy2(
-                    primary_labels[split][img_path.name], out_dir / split / "labels" / (img_path.stem + ".txt")
-                )
+                dst = out_dir / split / "labels" / (img_path.stem + ".txt")
+                jobs[dst] = partial(shutil.copy2, primary_labels[split][img_path.name], dst)
 
     # Add ball-only images to training set (or distribute across splits)
     ball_only_list = list(ball_only_images)
@@ -159,18 +182,19 @@ def merge_datasets(
         else:
             split = "test"
 
-        # Copy image
-        shutil.copy2(img_path, out_dir / split / "images" / img_path.name)
+        # Link/copy image
+        dst = out_dir / split / "images" / img_path.name
+        jobs[dst] = partial(_place_file, img_path, dst, link_mode)
 
-        # Create label file with ball annotations only
-        if img_path.name in ball_only_labels:
-            label_path = out_dir / split / "labels" / (img_path.stem + ".txt")
-            with open(label_path, "w") as f:
-                f.writelines(ball_only_labels[img_path.name])
-        else:
-            # Create empty label file (image with no annotations)
-            label_path = out_dir / split / "labels" / (img_path.stem + ".txt")
-            label_path.touch()
+        # Create label file with ball annotations only (empty file = image with no annotations)
+        label_path = out_dir / split / "labels" / (img_path.stem + ".txt")
+        jobs[label_path] = partial(label_path.write_text, "".join(ball_only_labels.get(img_path.name, [])))
+
+    # File copies are I/O-bound: overlap them on a thread pool
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(job) for job in jobs.values()]
+        for future in futures:
+            future.result()
 
     # Create data.yaml
     print("📝 Creating data.yaml...")
@@ -195,6 +219,74 @@ def merge_datasets(
     return str(out_dir)
 
 
+def _list_files(directory: Path) -> list[Path]:
+    """Files directly in ``directory`` (empty if it doesn't exist), from a single ``scandir`` pass."""
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as entries:
+        return [Path(e.path) for e in entries if e.is_file()]
+
+
+def _label_stems(labels_dir: Path) -> set[str]:
+    """Stems of the ``.txt`` label files in ``labels_dir`` (empty if it doesn't exist)."""
+    if not labels_dir.is_dir():
+        return set()
+    with os.scandir(labels_dir) as entries:
+        return {e.name[: -len(".txt")] for e in entries if e.name.endswith(".txt")}
+
+
+def _has_images(path: Path) -> bool:
+    """Whether ``path`` is a directory directly containing at least one image file."""
+    if not path.is_dir():
+        return False
+    with os.scandir(path) as entries:
+        return any(Path(e.name).suffix.lower() in _IMAGE_EXTENSIONS and e.is_file() for e in entries)
+
+
+def _place_file(src: Path, dst: Path, link_mode: LinkMode = "hardlink") -> None:
+    """
+    Put a copy of ``src`` at ``dst``, avoiding a byte copy where the filesystem allows it.
+
+    Tries ``os.link`` (hardlink), then ``os.copy_file_range`` (in-kernel copy; a reflink on Btrfs/XFS),
+    then ``shutil.copy2``, starting from the step selected by ``link_mode``.
+
+    Args:
+        src: Source file
+        dst: Destination path (replaced if it exists, left alone if it already is ``src`` or a hardlink to it)
+        link_mode: \"hardlink\", \"reflink\" or \"copy\"
+    """
+    # dst already holds src's bytes (an earlier hardlinked merge, or output overlapping the input):
+    # unlinking it could delete the only copy of src
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    # Never write through an existing dst
+    dst.unlink(missing_ok=True)
+
+    if link_mode == "hardlink":
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # e.g. EXDEV across filesystems, or no hardlink support
+
+    if link_mode in ("hardlink", "reflink") and hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
 def _extract_ball_annotations(label_path: Path, ball_class_id: int) -> list[str]:
     """
     Extract only ball annotations from a label file.
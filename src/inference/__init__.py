@@ -1,5 +1,19 @@
 """Inference module for video processing and object tracking."""
 
-from .video_processor import AnnotatorConfig, VideoProcessor
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .video_processor import AnnotatorConfig, VideoProcessor
 
 __all__ = ["VideoProcessor", "AnnotatorConfig"]
+
+
+def __getattr__(name: str) -> Any:
+    # Loaded on first use, so dependency-light submodules (e.g. _kernels) import without ultralytics
+    if name in __all__:
+        from . import video_processor
+
+        return getattr(video_processor, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,61 @@
+"""Per-frame numeric kernels, compiled with Numba when it is installed (numpy fallback otherwise)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+def _split_by_class_loop(
+    class_id: np.ndarray, confidence: np.ndarray, ball_class_id: int, ball_conf: float, player_conf: float
+) -> tuple[np.ndarray, np.ndarray]:
+    # Plain loop for Numba to compile: one pass, no temporary masks
+    n = class_id.shape[0]
+    ball_idx = np.empty(n, dtype=np.int64)
+    other_idx = np.empty(n, dtype=np.int64)
+    n_ball = 0
+    n_other = 0
+    for i in range(n):
+        if class_id[i] == ball_class_id:
+            if confidence[i] >= ball_conf:
+                ball_idx[n_ball] = i
+                n_ball += 1
+        elif confidence[i] >= player_conf:
+            other_idx[n_other] = i
+            n_other += 1
+    return ball_idx[:n_ball], other_idx[:n_other]
+
+
+def _jit(func: Any) -> Any | None:
+    """Compile ``func`` with Numba (cached on disk, GIL released while it runs), or None without Numba."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True, nogil=True)(func)
+
+
+_split_by_class_jit = _jit(_split_by_class_loop)
+
+
+def split_by_class(
+    class_id: np.ndarray, confidence: np.ndarray, ball_class_id: int, ball_conf: float, player_conf: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split detections into ball / non-ball and apply the per-class confidence thresholds in one pass.
+
+    Args:
+        class_id: Raw YOLO class IDs, shape (N,)
+        confidence: Detection confidences, shape (N,)
+        ball_class_id: Class ID of the ball
+        ball_conf: Minimum confidence kept for ball detections
+        player_conf: Minimum confidence kept for every other class
+
+    Returns:
+        (ball_idx, other_idx): ascending indices of the kept ball and non-ball detections
+    """
+    if _split_by_class_jit is not None:
+        return _split_by_class_jit(class_id, confidence, ball_class_id, ball_conf, player_conf)
+    is_ball = class_id == ball_class_id
+    return np.flatnonzero(is_ball & (confidence >= ball_conf)), np.flatnonzero(~is_ball & (confidence >= player_conf))
@@ -2,23 +2,43 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Literal, cast
+from fractions import Fraction
+from functools import cache, partial
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
 
+import numpy as np
 import supervision as sv
 from tqdm import tqdm
-from ultralytics import YOLO
+
+from ._kernels import split_by_class
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+T = TypeVar("T")
+
+# Goalkeeper, player, referee (class IDs 0-2 after the ball class is removed)
+_DEFAULT_TEAM_COLORS = ("#00BFFF", "#FF1493", "#FFD700")
 
 
 @dataclass
 class AnnotatorConfig:
-    """Configuration for video annotators."""
+    """Configuration for video annotators (``None`` colors select the default team colors)."""
 
-    ellipse_colors: list[str] | None = None
+    ellipse_colors: Sequence[str] | None = _DEFAULT_TEAM_COLORS
     ellipse_thickness: int = 2
-    label_colors: list[str] | None = None
+    label_colors: Sequence[str] | None = _DEFAULT_TEAM_COLORS
     label_text_color: str = "#000000"
     label_text_position: str = "BOTTOM_CENTER"
     triangle_color: str = "#FFD700"
@@ -26,16 +46,582 @@ class AnnotatorConfig:
     triangle_height: int = 21
     triangle_outline_thickness: int = 1
 
-    def __post_init__(self):
-        if self.ellipse_colors is None:
-            self.ellipse_colors = ["#00BFFF", "#FF1493", "#FFD700"]
-        if self.label_colors is None:
-            self.label_colors = ["#00BFFF", "#FF1493", "#FFD700"]
+
+def _batched(frames: Iterable[Any], batch_size: int) -> Iterator[list[Any]]:
+    """Group frames into lists of ``batch_size``; the last batch holds whatever is left over."""
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    batch: list[Any] = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@cache
+def _palette(hex_colors: tuple[str, ...]) -> sv.ColorPalette:
+    """Parse a hex palette once per process, however many processors share it."""
+    return sv.ColorPalette.from_hex(list(hex_colors))
+
+
+@cache
+def _color(hex_color: str) -> sv.Color:
+    """Parse a hex color once per process."""
+    return sv.Color.from_hex(hex_color)
+
+
+class _ProducerError:
+    """Wraps an exception raised on a ``_prefetch`` producer thread so the consumer can re-raise it."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_PRODUCER_DONE = object()
+
+
+def _prefetch(items: Iterable[T], maxsize: int) -> Generator[T, None, None]:
+    """
+    Iterate ``items`` on a background thread, handing results over through a bounded queue.
+
+    Used to overlap pipeline stages (decode, inference, encode): the producer runs ahead of the
+    consumer by at most ``maxsize`` items. Order is preserved and producer exceptions are re-raised
+    in the consuming thread. Closing the returned generator stops the producer.
+    """
+    q: queue.Queue[Any] = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_ProducerError(e))
+        finally:
+            put(_PRODUCER_DONE)
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _PRODUCER_DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+@dataclass
+class _FrameBatch:
+    """Decoded frames for one ``predict`` call."""
+
+    frames: list[Any]  # host BGR frames for annotation/writing (None entries when not needed)
+    tensor: Any | None = None  # the same frames as a uint8 BCHW RGB tensor when decoded on the GPU
+    stream_ids: list[int] | None = None  # source stream of each frame when batching several videos (else all 0)
+
+
+def _cuda_available() -> bool:
+    """Whether torch can see a CUDA device."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def _open_gpu_decoder(
+    source_path: str, backend: Literal["torchcodec", "decord"]
+) -> tuple[int, Callable[[int, int, int], Any]] | None:
+    """
+    Open an NVDEC-backed decoder that returns frames in CUDA memory.
+
+    Returns:
+        (frame count, ``read(start, stop, step)`` -> uint8 BCHW RGB CUDA tensor), or None if the backend
+        or CUDA is unavailable
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+
+    if backend == "torchcodec":
+        try:
+            from torchcodec.decoders import VideoDecoder
+
+            # CPU-only builds and codecs NVDEC can't handle fail here rather than at import
+            decoder = VideoDecoder(source_path, device="cuda")
+        except Exception:
+            return None
+        return len(decoder), lambda start, stop, step: decoder.get_frames_in_range(start, stop, step).data
+
+    try:
+        import decord
+
+        # PyPI wheels are CPU-only; opening on gpu(0) fails unless decord was built with CUDA
+        reader = decord.VideoReader(source_path, ctx=decord.gpu(0))
+    except Exception:
+        return None
+
+    def read(start: int, stop: int, step: int) -> Any:
+        # BHWC RGB NDArray on the GPU, handed to torch via DLPack without a copy
+        batch = reader.get_batch(list(range(start, stop, step)))
+        return torch.utils.dlpack.from_dlpack(batch.to_dlpack()).permute(0, 3, 1, 2)
+
+    return len(reader), read
+
+
+def _iter_frame_batches(
+    source_path: str,
+    batch_size: int,
+    decoder_backend: Literal["opencv", "torchcodec", "decord"] = "opencv",
+    host_frames: bool = True,
+    vid_stride: int = 1,
+) -> Iterator[_FrameBatch]:
+    """
+    Decode a video into batches of ``batch_size`` frames.
+
+    Args:
+        source_path: Path to input video
+        batch_size: Frames per batch (the last batch may be shorter)
+        decoder_backend: \"opencv\" — CPU decode via supervision;
+                         \"torchcodec\" / \"decord\" — NVDEC decode straight into CUDA memory (falls back to opencv)
+        host_frames: Whether GPU-decoded batches also need BGR numpy copies (for annotation/writing)
+        vid_stride: Keep every ``vid_stride``-th frame, starting with the first
+    """
+    decoder = _open_gpu_decoder(source_path, decoder_backend) if decoder_backend != "opencv" else None
+    if decoder_backend != "opencv" and decoder is None:
+        print(f"⚠️  {decoder_backend} with CUDA not available, decoding on CPU with OpenCV")
+
+    if decoder is None:
+        for frames in _batched(sv.get_video_frames_generator(source_path, stride=vid_stride), batch_size):
+            yield _FrameBatch(frames)
+        return
+
+    total, read = decoder
+    span = batch_size * vid_stride
+    for start in range(0, total, span):
+        tensor = read(start, min(start + span, total), vid_stride)
+        if host_frames:
+            frames = list(tensor.flip(1).permute(0, 2, 3, 1).contiguous().cpu().numpy())
+        else:
+            frames = [None] * len(tensor)
+        yield _FrameBatch(frames, tensor)
+
+
+def _interleave_batches(streams: Sequence[Iterator[Any]], batch_size: int) -> Iterator[_FrameBatch]:
+    """
+    Fan frames from several videos into shared batches, taking one frame from each stream in turn.
+
+    Each batch records which stream every frame came from; frames of one stream stay in order.
+    Streams that run out drop out of the rotation; the last batch may be shorter.
+    """
+    live = list(enumerate(streams))
+    frames: list[Any] = []
+    stream_ids: list[int] = []
+    while live:
+        still_live = []
+        for stream_id, stream in live:
+            frame = next(stream, None)
+            if frame is None:
+                continue
+            still_live.append((stream_id, stream))
+            frames.append(frame)
+            stream_ids.append(stream_id)
+            if len(frames) == batch_size:
+                yield _FrameBatch(frames, stream_ids=stream_ids)
+                frames, stream_ids = [], []
+        live = still_live
+    if frames:
+        yield _FrameBatch(frames, stream_ids=stream_ids)
+
+
+def _letterbox_gpu(batch: Any, imgsz: int) -> tuple[Any, float, tuple[int, int]]:
+    """
+    Letterbox a uint8 BCHW RGB tensor to ``imgsz`` x ``imgsz`` on its own device.
+
+    Mirrors ultralytics' CPU letterbox (bilinear resize, centred gray padding) and scales to [0, 1],
+    which is what ``model.predict`` expects for tensor sources. CUDA batches are processed in FP16
+    (half the memory traffic of FP32; ultralytics casts to the model's dtype anyway).
+
+    Returns:
+        (letterboxed float tensor, resize gain, (pad_x, pad_y)) for ``_unletterbox``
+    """
+    import torch
+    import torch.nn.functional as F
+
+    height, width = batch.shape[-2:]
+    gain = min(imgsz / height, imgsz / width)
+    new_h, new_w = round(height * gain), round(width * gain)
+    pad_x, pad_y = (imgsz - new_w) // 2, (imgsz - new_h) // 2
+    x = batch.to(torch.float16 if batch.is_cuda else torch.float32).div_(255)
+    if (new_h, new_w) != (height, width):
+        x = F.interpolate(x, size=(new_h, new_w), mode="bilinear", align_corners=False)
+    x = F.pad(x, (pad_x, imgsz - new_w - pad_x, pad_y, imgsz - new_h - pad_y), value=114 / 255)
+    return x, gain, (pad_x, pad_y)
+
+
+def _unletterbox(detections: sv.Detections, gain: float, pad: tuple[int, int], shape: tuple[int, int]) -> None:
+    """Map boxes predicted on a ``_letterbox_gpu`` tensor back to source frame pixels, in place."""
+    if len(detections) == 0:
+        return
+    pad_x, pad_y = pad
+    height, width = shape
+    xyxy = detections.xyxy
+    np.subtract(xyxy, (pad_x, pad_y, pad_x, pad_y), out=xyxy)
+    np.divide(xyxy, gain, out=xyxy)
+    np.clip(xyxy, 0, (width, height, width, height), out=xyxy)
+
+
+def _detections_from_results(results: Iterable[Any]) -> list[sv.Detections]:
+    """
+    Convert a batch of ultralytics ``Results`` to ``sv.Detections`` with one device->host copy.
+
+    ``sv.Detections.from_ultralytics`` pulls xyxy, conf and cls off the GPU separately for every frame.
+    Here each frame's ``boxes.data`` (rows of xyxy, conf, cls) is concatenated on the device and copied
+    to the host once per batch, then split back into frames. Only the box tensors are kept while
+    iterating, so a streamed ``predict`` never holds the full ``Results`` list (with its frame copies).
+    """
+    boxes = [result.boxes.data for result in results]
+    if not boxes:
+        return []
+    import torch
+
+    data = torch.cat(boxes).contiguous().cpu().numpy()
+    counts = np.cumsum([len(b) for b in boxes])[:-1]
+    return [
+        sv.Detections(xyxy=rows[:, :4], confidence=rows[:, -2], class_id=rows[:, -1].astype(int))
+        for rows in np.split(data, counts)
+    ]
+
+
+def _model_imgsz(model: YOLO) -> int:
+    """Input size the model was trained at (ultralytics' 640 default if unknown)."""
+    imgsz = model.overrides.get("imgsz") or 640
+    return int(max(imgsz) if isinstance(imgsz, (list, tuple)) else imgsz)
+
+
+def _class_remap(model: YOLO, ball_class_id: int) -> np.ndarray | None:
+    """
+    Lookup table from YOLO class ID to palette index, built from ``model.names``.
+
+    Non-ball classes are numbered 0, 1, 2, ... in class ID order (goalkeeper/player/referee for the
+    4-class model); the ball maps to -1. None if the model does not expose its class names.
+    """
+    names = getattr(model, "names", None)
+    if not names:
+        return None
+    remap = np.full(max(names) + 1, -1, dtype=np.int64)
+    others = [class_id for class_id in sorted(names) if class_id != ball_class_id]
+    remap[others] = np.arange(len(others))
+    return remap
+
+
+def _numpy_to_builtin(obj: Any) -> Any:
+    """``json.dumps`` hook: numpy arrays/scalars become lists/Python numbers (as orjson's OPT_SERIALIZE_NUMPY)."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _default_json_path(target_path: str, eval_mode: Literal["full", "model_only"]) -> str:
+    """Detections JSON path next to ``target_path`` (e.g. output.mp4 -> output_detections.json)."""
+    suffix = "_detections.json" if eval_mode == "full" else "_model_only_detections.json"
+    return os.path.splitext(target_path)[0] + suffix
+
+
+def _json_header(source_path: str, video_info: sv.VideoInfo) -> dict[str, Any]:
+    """Leading fields of a detections JSON document."""
+    return {
+        "video_info": {
+            "source_path": source_path,
+            "fps": video_info.fps,
+            "width": video_info.width,
+            "height": video_info.height,
+            "total_frames": video_info.total_frames,
+        },
+    }
+
+
+def _json_encoder() -> Callable[[Any], bytes]:
+    """
+    ``orjson.dumps`` when installed (several times faster), else the stdlib encoder.
+
+    Both accept numpy arrays and scalars, so frame entries may carry them without converting first.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, separators=(",", ":"), default=_numpy_to_builtin).encode()
+    return partial(orjson.dumps, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class _DetectionJsonWriter:
+    """
+    Stream the detections JSON document to disk while frames are still being processed.
+
+    Produces the same document as one ``json.dump`` of ``{**header, "detections": [...], **footer}``.
+    Each frame entry is encoded as soon as it is appended (so the dict can be freed right away), and the
+    encoded lines are written ``flush_every`` at a time on a background thread, so the frame loop never
+    blocks on file I/O and memory stays bounded.
+
+    The document is built in ``path + ".tmp"`` and only moved to ``path`` by ``close()``. Used as a context
+    manager, an exception discards it instead, so a failed run never leaves a valid but truncated file.
+    """
+
+    def __init__(self, path: str, header: dict[str, Any], footer: dict[str, Any] | None = None, flush_every: int = 256):
+        self._encode = _json_encoder()
+        self._path = path
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "wb")  # noqa: SIM115 -- owned by the writer, released in close()
+        self._footer = footer or {}
+        self._flush_every = flush_every
+        self._pending: list[bytes] = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._in_flight: Future[None] | None = None
+        self._first_chunk = True
+        # Header fields, then the opening of the detections array
+        self._file.write(self._encode(header)[:-1] + (b"," if header else b"") + b'"detections":[\n')
+
+    def append(self, frame_data: dict[str, Any]) -> None:
+        self._pending.append(self._encode(frame_data))
+        if len(self._pending) >= self._flush_every:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        # At most one chunk in flight: waiting here bounds memory and surfaces write errors early
+        if self._in_flight is not None:
+            self._in_flight.result()
+        frames, self._pending = self._pending, []
+        self._in_flight = self._executor.submit(self._write_chunk, frames)
+
+    def _write_chunk(self, frames: list[bytes]) -> None:
+        chunk = b",\n".join(frames)
+        if not self._first_chunk:
+            chunk = b",\n" + chunk
+        self._first_chunk = False
+        self._file.write(chunk)
+
+    def close(self) -> None:
+        """Write the remaining frames and the closing fields, then move the document to its final path."""
+        try:
+            self._flush()
+            if self._in_flight is not None:
+                self._in_flight.result()
+            footer = self._encode(self._footer)[1:] if self._footer else b"}"
+            self._file.write(b"\n]" + (b"," if self._footer else b"") + footer + b"\n")
+        except BaseException:
+            self.abort()
+            raise
+        self._executor.shutdown(wait=True)
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+
+    def abort(self) -> None:
+        """Stop writing and delete the partial document."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> _DetectionJsonWriter:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+@cache
+def _nvenc_available(ffmpeg_exe: str) -> bool:
+    """Whether ``ffmpeg_exe`` can actually encode with h264_nvenc (built with it *and* a usable NVIDIA GPU)."""
+    probe = [ffmpeg_exe, "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", "color=size=256x256"]
+    probe += ["-frames:v", "1", "-c:v", "h264_nvenc", "-f", "null", "-"]
+    try:
+        return subprocess.run(probe, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+class _FfmpegVideoSink:
+    """
+    Drop-in for ``sv.VideoSink`` that pipes raw BGR frames to an ffmpeg subprocess (imageio-ffmpeg).
+
+    Encoding runs in ffmpeg's own process — on the GPU with h264_nvenc when available, else libx264 —
+    so the write loop only copies frame bytes into a pipe.
+    """
+
+    def __init__(self, target_path: str, video_info: sv.VideoInfo):
+        import imageio_ffmpeg
+
+        self.codec = "h264_nvenc" if _nvenc_available(imageio_ffmpeg.get_ffmpeg_exe()) else "libx264"
+        self._writer = imageio_ffmpeg.write_frames(
+            target_path,
+            size=(video_info.width, video_info.height),
+            fps=video_info.fps,
+            codec=self.codec,
+            quality=6,
+            pix_fmt_in="bgr24",
+            macro_block_size=2,
+        )
+
+    def __enter__(self) -> _FfmpegVideoSink:
+        self._writer.send(None)  # start the ffmpeg process
+        return self
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        self._writer.send(np.ascontiguousarray(frame))
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._writer.close()
+
+
+@cache
+def _pyav_nvenc_available() -> bool:
+    """Whether PyAV's FFmpeg can open an h264_nvenc encoder (built with it *and* a usable NVIDIA GPU)."""
+    import av
+
+    try:
+        ctx = av.CodecContext.create("h264_nvenc", "w")
+        ctx.width, ctx.height, ctx.pix_fmt, ctx.time_base = 256, 256, "yuv420p", Fraction(1, 25)
+        ctx.open()
+    except Exception:
+        return False
+    return True
+
+
+class _PyAVVideoSink:
+    """
+    Drop-in for ``sv.VideoSink`` that encodes in-process with PyAV, on the GPU (h264_nvenc) when available.
+
+    FFmpeg converts BGR to YUV and encodes in C, so the write loop does no per-pixel work in Python.
+    """
+
+    def __init__(self, target_path: str, video_info: sv.VideoInfo):
+        import av
+
+        self.codec = "h264_nvenc" if _pyav_nvenc_available() else "libx264"
+        self._av = av
+        self._container = av.open(target_path, mode="w")
+        self._stream: Any = self._container.add_stream(
+            self.codec,
+            rate=Fraction(video_info.fps).limit_denominator(1001),
+            width=video_info.width,
+            height=video_info.height,
+            pix_fmt="yuv420p",
+        )
+
+    def __enter__(self) -> _PyAVVideoSink:
+        return self
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        video_frame = self._av.VideoFrame.from_ndarray(frame, format="bgr24")
+        self._container.mux(self._stream.encode(video_frame))
+
+    def __exit__(self, *exc_info: object) -> None:
+        try:
+            self._container.mux(self._stream.encode(None))  # flush delayed frames
+        finally:
+            self._container.close()
+
+
+def _open_video_sink(
+    target_path: str, video_info: sv.VideoInfo, encoder: Literal["opencv", "ffmpeg", "pyav"] = "opencv"
+) -> sv.VideoSink | _FfmpegVideoSink | _PyAVVideoSink:
+    """Open the annotated-video writer for ``encoder``, falling back to OpenCV if its library is missing."""
+    try:
+        if encoder == "ffmpeg":
+            sink: _FfmpegVideoSink | _PyAVVideoSink = _FfmpegVideoSink(target_path, video_info)
+        elif encoder == "pyav":
+            sink = _PyAVVideoSink(target_path, video_info)
+        else:
+            return sv.VideoSink(target_path, video_info=video_info)
+    except ImportError:
+        print(f"⚠️  {'imageio-ffmpeg' if encoder == 'ffmpeg' else 'PyAV'} not installed, encoding with OpenCV")
+        return sv.VideoSink(target_path, video_info=video_info)
+    print(f"🎞️  Encoding with {encoder} ({sink.codec})")
+    return sink
+
+
+def _export_tensorrt_engine(
+    model_path: str,
+    imgsz: int | None = None,
+    batch: int = 16,
+    precision: Literal["fp16", "int8"] = "fp16",
+    int8_data: str | None = None,
+) -> str:
+    """
+    Export YOLO weights to a TensorRT engine next to the weights file.
+
+    An existing engine is reused as long as it is newer than the weights. The engine's shape profile is
+    fixed at export, so the cache name records precision, max batch and input size (e.g.
+    ``model_b16_640.engine`` / ``model_int8_b16_640.engine``) and a run with different ones exports anew.
+
+    Args:
+        model_path: Path to ``.pt`` weights
+        imgsz: Engine input size (default: the size the model was trained at)
+        batch: Largest batch the engine accepts (built with dynamic batch, so smaller batches work too)
+        precision: "fp16" or "int8" (INT8 is calibrated on ``int8_data``)
+        int8_data: Dataset YAML whose images are used for INT8 calibration (required for int8)
+
+    Returns:
+        Path to the ``.engine`` file
+    """
+    if precision == "int8" and int8_data is None:
+        raise ValueError("INT8 TensorRT export needs a calibration dataset (int8_data)")
+    base = os.path.splitext(model_path)[0]
+    engine_path = base + ("_int8" if precision == "int8" else "") + f"_b{batch}"
+    engine_path += (f"_{imgsz}" if imgsz is not None else "") + ".engine"
+    if os.path.isfile(engine_path) and os.path.getmtime(engine_path) >= os.path.getmtime(model_path):
+        return engine_path
+    export_args: dict[str, Any] = {"format": "engine", "half": True, "dynamic": True, "batch": batch, "device": 0}
+    if precision == "int8":
+        export_args.update(half=False, int8=True, data=int8_data)
+    if imgsz is not None:
+        export_args["imgsz"] = imgsz
+    # Ultralytics always writes <weights stem>.engine (plus .onnx) next to the weights, which would clobber
+    # whatever is there: export from a copy named after the cache entry in a scratch dir on the same filesystem
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(model_path))) as tmp_dir:
+        weights = os.path.join(tmp_dir, os.path.splitext(os.path.basename(engine_path))[0] + ".pt")
+        shutil.copyfile(model_path, weights)
+        from ultralytics import YOLO
+
+        exported = str(YOLO(weights).export(**export_args))
+        os.replace(exported, engine_path)
+    return engine_path
 
 
 class VideoProcessor:
     """Process videos with object detection and tracking."""
 
+    # Balls are small: their boxes are padded by this many pixels on every side
+    _BALL_PAD_PX = 10
+
     def __init__(
         self,
         model_path: str,
@@ -47,6 +633,14 @@ class VideoProcessor:
         ball_nms_threshold: float = 0.3,
         iou_threshold: float = 0.5,
         config: AnnotatorConfig | None = None,
+        warmup_runs: int = 3,
+        warmup_shape: tuple[int, int] | None = None,
+        use_tensorrt: bool = False,
+        imgsz: int | None = None,
+        tensorrt_batch: int = 16,
+        gpu_preprocess: bool = False,
+        precision: Literal["fp16", "int8"] = "fp16",
+        int8_data: str | None = None,
     ):
         """
         Initialize video processor.
@@ -61,9 +655,39 @@ class VideoProcessor:
             ball_nms_threshold: NMS threshold for ball detections (removes duplicate ball detections)
             iou_threshold: IoU threshold for YOLO internal NMS
             config: Annotator configuration
+            warmup_runs: Dummy inferences run at init so the first real frame doesn't pay CUDA/cuDNN setup (0 = off)
+            warmup_shape: (height, width) of the warmup frame; pass the video resolution to pre-tune for it
+                          (default: 640x640)
+            use_tensorrt: Export ``.pt`` weights to a cached TensorRT engine and run that instead
+                          (falls back to the ``.pt`` model if export fails, e.g. no TensorRT installed)
+            imgsz: Model input size used for TensorRT export and GPU letterboxing
+                   (default: the size the model was trained at)
+            tensorrt_batch: Largest batch the TensorRT engine accepts; keep >= process_video's batch_size
+            gpu_preprocess: Upload each CPU-decoded batch once and letterbox it to ``imgsz`` on the GPU, instead
+                            of ultralytics resizing every frame on the CPU (ignored without CUDA)
+            precision: TensorRT engine precision, "fp16" or "int8" (only used with ``use_tensorrt``)
+            int8_data: Dataset YAML with calibration images for ``precision="int8"``
         """
+        # Imported here so the module's helpers load (and test) without ultralytics/torch installed
+        from ultralytics import YOLO
+
+        if use_tensorrt and model_path.endswith(".pt"):
+            try:
+                imgsz = imgsz or _model_imgsz(YOLO(model_path))
+                model_path = _export_tensorrt_engine(
+                    model_path, imgsz=imgsz, batch=tensorrt_batch, precision=precision, int8_data=int8_data
+                )
+                print(f"⚡ Using TensorRT engine: {model_path}")
+            except Exception as e:
+                print(f"⚠️  TensorRT export failed, using PyTorch weights: {e}")
         self.model = YOLO(model_path)
+        self.imgsz = imgsz or _model_imgsz(self.model)
+        self.gpu_preprocess = gpu_preprocess and _cuda_available()
+        if gpu_preprocess and not self.gpu_preprocess:
+            print("⚠️  CUDA not available, preprocessing frames on the CPU")
+        self._pinned: Any = None  # pinned host staging buffer for _upload, sized on first use
         self.ball_class_id = ball_class_id
+        self._class_remap = _class_remap(self.model, ball_class_id)
         self.conf_min = conf_min
         self.ball_conf = ball_conf
         self.player_conf = player_conf
@@ -71,21 +695,21 @@ class VideoProcessor:
         self.ball_nms_threshold = ball_nms_threshold
         self.iou_threshold = iou_threshold
         self.config = config or AnnotatorConfig()
-        ellipse_colors = self.config.ellipse_colors
-        label_colors = self.config.label_colors
-        assert ellipse_colors is not None and label_colors is not None  # set in AnnotatorConfig.__post_init__
 
         # Initialize annotators
+        ellipse_colors = self.config.ellipse_colors
+        label_colors = self.config.label_colors
         self.ellipse_annotator = sv.EllipseAnnotator(
-            color=sv.ColorPalette.from_hex(ellipse_colors), thickness=self.config.ellipse_thickness
+            color=_palette(tuple(ellipse_colors if ellipse_colors is not None else _DEFAULT_TEAM_COLORS)),
+            thickness=self.config.ellipse_thickness,
         )
         self.label_annotator = sv.LabelAnnotator(
-            color=sv.ColorPalette.from_hex(label_colors),
-            text_color=sv.Color.from_hex(self.config.label_text_color),
-            text_position=getattr(sv.Position, self.config.label_text_position),
+            color=_palette(tuple(label_colors if label_colors is not None else _DEFAULT_TEAM_COLORS)),
+            text_color=_color(self.config.label_text_color),
+            text_position=sv.Position[self.config.label_text_position],
         )
         self.triangle_annotator = sv.TriangleAnnotator(
-            color=sv.Color.from_hex(self.config.triangle_color),
+            color=_color(self.config.triangle_color),
             base=self.config.triangle_base,
             height=self.config.triangle_height,
             outline_thickness=self.config.triangle_outline_thickness,
@@ -94,10 +718,74 @@ class VideoProcessor:
         # Initialize tracker
         self.tracker = sv.ByteTrack()
 
+        self._warmup(warmup_runs, warmup_shape or (640, 640))
+
+    def _warmup(self, runs: int, shape: tuple[int, int]) -> None:
+        """Pay one-time model initialization (CUDA context, cuDNN autotune, allocations) up front."""
+        if runs <= 0:
+            return
+        dummy = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
+        try:
+            for _ in range(runs):
+                self._predict([dummy])
+        except Exception as e:
+            print(f"⚠️  Model warmup skipped: {e}")
+
+    def _predict(self, frames: Any) -> list[sv.Detections]:
+        """
+        Run YOLO on a batch of frames in a single ``predict`` call.
+
+        Args:
+            frames: Input frames (list of numpy arrays, or a preprocessed BCHW tensor)
+
+        Returns:
+            One ``sv.Detections`` per input frame, in order
+        """
+        # Run inference with low conf to retain raw candidates; per-class filtering applied after
+        results = self.model.predict(
+            source=frames, conf=self.conf_min, iou=self.iou_threshold, verbose=False, stream=True
+        )
+        return _detections_from_results(results)
+
+    def _upload(self, frames: list[Any]) -> Any:
+        """Stack BGR numpy frames into one uint8 BCHW RGB tensor on the GPU, for ``_predict_gpu``."""
+        import torch
+
+        # Stack straight into a reused pinned host buffer: no intermediate array, and the copy to the
+        # GPU is a real async DMA. Reuse is safe because the previous batch's predictions were already
+        # copied back to the host (which waits for its upload) before the next upload starts.
+        shape = (len(frames), *frames[0].shape)
+        if self._pinned is None or self._pinned.shape[0] < shape[0] or self._pinned.shape[1:] != shape[1:]:
+            self._pinned = torch.empty(shape, dtype=torch.uint8, pin_memory=True)
+        staging = self._pinned[: shape[0]]
+        np.stack(frames, out=staging.numpy())
+        batch = staging.to("cuda", non_blocking=True)
+        return batch.permute(0, 3, 1, 2).flip(1)
+
+    def _predict_gpu(self, batch: Any) -> list[sv.Detections]:
+        """
+        Run YOLO on frames that are already on the GPU, without a round trip through host memory.
+
+        Args:
+            batch: uint8 BCHW RGB tensor (as produced by the torchcodec decoder)
+
+        Returns:
+            One ``sv.Detections`` per frame, with boxes in source frame pixels
+        """
+        shape = tuple(batch.shape[-2:])
+        tensor, gain, pad = _letterbox_gpu(batch, self.imgsz)
+        detections_batch = self._predict(tensor)
+        for detections in detections_batch:
+            _unletterbox(detections, gain, pad, shape)
+        return detections_batch
+
     def process_frame(self, frame, return_detections: bool = False):
         """
         Process a single frame.
 
+        The frame is annotated in place and returned; pass a copy if the original pixels are still needed.
+        Read-only frames are copied first.
+
         Args:
             frame: Input frame (numpy array)
             return_detections: If True, return detection data along with annotated frame
@@ -105,43 +793,95 @@ class VideoProcessor:
         Returns:
             Annotated frame, or tuple of (annotated_frame, detection_data) if return_detections=True
         """
-        # Run inference with low conf to retain raw candidates; per-class filtering applied after
-        result = self.model.predict(source=frame, conf=self.conf_min, iou=self.iou_threshold, verbose=False)[0]
-        detections = sv.Detections.from_ultralytics(result)
+        return self._track_and_annotate(frame, self._predict([frame])[0], return_detections=return_detections)
+
+    def _track_and_annotate(self, frame, detections: sv.Detections, return_detections: bool = False):
+        """
+        Filter, track and annotate one frame's raw YOLO detections.
+
+        Must be called once per frame in frame order: the tracker is stateful. ``frame`` is annotated in place.
+
+        Args:
+            frame: Input frame (numpy array) the detections belong to, or None to skip annotation
+            detections: Raw YOLO detections for ``frame``
+            return_detections: If True, return detection data along with annotated frame
+
+        Returns:
+            Annotated frame (None if ``frame`` is None), or tuple of (annotated_frame, detection_data)
+            if return_detections=True
+        """
+        all_detections, ball_detections = self._track(detections, self.tracker)
+        annotated_frame = self._annotate(frame, all_detections, ball_detections) if frame is not None else None
 
-        # Separate ball detections, apply per-class confidence filter, and NMS to remove duplicates
-        ball_detections = cast(sv.Detections, detections[detections.class_id == self.ball_class_id])
-        if ball_detections.confidence is not None:
-            ball_detections = cast(sv.Detections, ball_detections[ball_detections.confidence >= self.ball_conf])
+        if return_detections:
+            detection_data = self._extract_detection_data(all_detections, ball_detections)
+            return annotated_frame, detection_data
+
+        return annotated_frame
+
+    def _track(self, detections: sv.Detections, tracker: sv.ByteTrack) -> tuple[sv.Detections, sv.Detections]:
+        """
+        Filter one frame's raw YOLO detections and update ``tracker`` with them.
+
+        Must be called once per frame in frame order, with the tracker of the video the frame belongs to:
+        the tracker is stateful.
+
+        Returns:
+            (tracked non-ball detections with class IDs shifted to 0-2, padded ball detections)
+        """
+        # Split ball / non-ball and apply the per-class confidence filters in one pass; integer indices are
+        # computed once and reused for every field, where a boolean mask would be re-scanned per array
+        class_id = detections.class_id
+        assert class_id is not None
+        confidence = detections.confidence if detections.confidence is not None else np.full(len(class_id), np.inf)
+        ball_idx, other_idx = split_by_class(class_id, confidence, self.ball_class_id, self.ball_conf, self.player_conf)
+
+        # Ball detections: NMS to remove duplicates, then pad
+        ball_detections = cast(sv.Detections, detections[ball_idx])
         if len(ball_detections) > 0:
             ball_detections = ball_detections.with_nms(threshold=self.ball_nms_threshold, class_agnostic=True)
         if len(ball_detections) > 0:
-            ball_detections.xyxy = sv.pad_boxes(xyxy=ball_detections.xyxy, px=10)
+            # In place: ball_detections owns its arrays (fancy indexing above copies them)
+            ball_xyxy = ball_detections.xyxy
+            np.subtract(ball_xyxy[:, :2], self._BALL_PAD_PX, out=ball_xyxy[:, :2])
+            np.add(ball_xyxy[:, 2:], self._BALL_PAD_PX, out=ball_xyxy[:, 2:])
 
-        # Process other detections (players, goalkeepers, referees) with per-class confidence filter
-        all_detections = cast(sv.Detections, detections[detections.class_id != self.ball_class_id])
-        if all_detections.confidence is not None:
-            all_detections = cast(sv.Detections, all_detections[all_detections.confidence >= self.player_conf])
+        # Process other detections (players, goalkeepers, referees)
+        all_detections = cast(sv.Detections, detections[other_idx])
         all_detections = all_detections.with_nms(threshold=self.nms_threshold, class_agnostic=True)
-        # Adjust class IDs (subtract 1 since ball is class 0)
+        # Adjust class IDs to palette indices: one gather through the table built from model.names
+        # (the legacy "subtract 1 since ball is class 0" if the model has no names)
         if all_detections.class_id is not None:
-            all_detections.class_id = all_detections.class_id - 1
-        all_detections = self.tracker.update_with_detections(detections=all_detections)
+            if self._class_remap is not None:
+                all_detections.class_id = self._class_remap[all_detections.class_id]
+            else:
+                np.subtract(all_detections.class_id, 1, out=all_detections.class_id)
+        all_detections = tracker.update_with_detections(detections=all_detections)
+        return all_detections, ball_detections
 
-        # Create labels with tracker IDs
-        labels = [f"#{int(tid)}" for tid in all_detections.tracker_id] if all_detections.tracker_id is not None else []
+    def _annotate(self, frame, tracked_detections: sv.Detections, ball_detections: sv.Detections):
+        """
+        Draw ellipses + tracker ID labels for tracked objects and triangles for the ball, in place.
 
-        # Annotate frame
-        annotated_frame = frame.copy()
-        annotated_frame = self.ellipse_annotator.annotate(scene=annotated_frame, detections=all_detections)
-        annotated_frame = self.label_annotator.annotate(scene=annotated_frame, detections=all_detections, labels=labels)
-        annotated_frame = self.triangle_annotator.annotate(scene=annotated_frame, detections=ball_detections)
+        Touches no tracker state, so frames can be annotated concurrently (OpenCV drawing releases the GIL).
 
-        if return_detections:
-            detection_data = self._extract_detection_data(all_detections, ball_detections)
-            return annotated_frame, detection_data
+        Returns:
+            The annotated frame (``frame`` itself unless it was read-only)
+        """
+        # Create labels with tracker IDs
+        tracker_ids = tracked_detections.tracker_id
+        labels = np.char.add("#", tracker_ids.astype(str)).tolist() if tracker_ids is not None else []
 
-        return annotated_frame
+        # Annotate in place: saves a full-frame allocation + copy per frame. Decoders hand over writable
+        # frames, so this copy only happens for read-only inputs (e.g. arrays backed by immutable bytes).
+        # No reused scratch buffer: annotated frames queue up for the writer thread, so they must not alias.
+        if not frame.flags.writeable:
+            frame = frame.copy()
+        annotated_frame = self.ellipse_annotator.annotate(scene=frame, detections=tracked_detections)
+        annotated_frame = self.label_annotator.annotate(
+            scene=annotated_frame, detections=tracked_detections, labels=labels
+        )
+        return self.triangle_annotator.annotate(scene=annotated_frame, detections=ball_detections)
 
     def _extract_detection_data(self, tracked_detections: sv.Detections, ball_detections: sv.Detections) -> dict:
         """
@@ -154,49 +894,51 @@ class VideoProcessor:
         Returns:
             Dictionary containing detection data
         """
+        # One bulk .tolist() per column instead of unboxing numpy scalars element by element
         detection_data: dict[str, list[Any]] = {"tracked_objects": [], "ball": []}
 
         # Extract tracked objects (players, goalkeepers, referees)
-        if len(tracked_detections) > 0:
+        n = len(tracked_detections)
+        if n > 0:
             t_xyxy = tracked_detections.xyxy
             t_class_id = tracked_detections.class_id
             assert t_xyxy is not None and t_class_id is not None
-            for i in range(len(tracked_detections)):
-                bbox = t_xyxy[i].tolist()
-                class_id = int(t_class_id[i])
-                tracker_id = (
-                    int(tracked_detections.tracker_id[i]) if tracked_detections.tracker_id is not None else None
-                )
-                confidence = (
-                    float(tracked_detections.confidence[i]) if tracked_detections.confidence is not None else None
-                )
-
-                detection_data["tracked_objects"].append(
-                    {
-                        "bbox": bbox,  # [x1, y1, x2, y2]
-                        "class_id": class_id,
-                        "tracker_id": tracker_id,
-                        "confidence": confidence,
-                    }
+            tracker_ids = tracked_detections.tracker_id
+            confidences = tracked_detections.confidence
+            detection_data["tracked_objects"] = [
+                {
+                    "bbox": bbox,  # [x1, y1, x2, y2]
+                    "class_id": class_id,
+                    "tracker_id": tracker_id,
+                    "confidence": confidence,
+                }
+                for bbox, class_id, tracker_id, confidence in zip(
+                    t_xyxy.tolist(),
+                    t_class_id.astype(int).tolist(),
+                    tracker_ids.astype(int).tolist() if tracker_ids is not None else [None] * n,
+                    confidences.tolist() if confidences is not None else [None] * n,
                 )
+            ]
 
         # Extract ball detections
-        if len(ball_detections) > 0:
+        n = len(ball_detections)
+        if n > 0:
             b_xyxy = ball_detections.xyxy
             b_class_id = ball_detections.class_id
             assert b_xyxy is not None and b_class_id is not None
-            for i in range(len(ball_detections)):
-                bbox = b_xyxy[i].tolist()
-                class_id = int(b_class_id[i])
-                confidence = float(ball_detections.confidence[i]) if ball_detections.confidence is not None else None
-
-                detection_data["ball"].append(
-                    {
-                        "bbox": bbox,  # [x1, y1, x2, y2]
-                        "class_id": class_id,
-                        "confidence": confidence,
-                    }
+            confidences = ball_detections.confidence
+            detection_data["ball"] = [
+                {
+                    "bbox": bbox,  # [x1, y1, x2, y2]
+                    "class_id": class_id,
+                    "confidence": confidence,
+                }
+                for bbox, class_id, confidence in zip(
+                    b_xyxy.tolist(),
+                    b_class_id.astype(int).tolist(),
+                    confidences.tolist() if confidences is not None else [None] * n,
                 )
+            ]
 
         return detection_data
 
@@ -206,8 +948,10 @@ class VideoProcessor:
 
         Each frame is written as {\"frame_number\", \"objects\"} with canonical class_id 0–3.
         """
-        result = self.model.predict(source=frame, conf=self.conf_min, iou=self.iou_threshold, verbose=False)[0]
-        detections = sv.Detections.from_ultralytics(result)
+        return self._model_only_frame(self._predict([frame])[0], frame_number)
+
+    def _model_only_frame(self, detections: sv.Detections, frame_number: int) -> dict[str, Any]:
+        """Serialize raw YOLO detections as a model-only frame entry."""
         objects: list[dict[str, Any]] = []
         n = len(detections)
         if n == 0:
@@ -215,13 +959,85 @@ class VideoProcessor:
         d_xyxy = detections.xyxy
         d_class_id = detections.class_id
         assert d_xyxy is not None and d_class_id is not None
-        for i in range(n):
-            bbox = d_xyxy[i].tolist()
-            cid = int(d_class_id[i])
-            conf = float(detections.confidence[i]) if detections.confidence is not None else None
-            objects.append({"bbox": bbox, "class_id": cid, "confidence": conf})
+        confs = detections.confidence.tolist() if detections.confidence is not None else [None] * n
+        objects = [
+            {"bbox": bbox, "class_id": cid, "confidence": conf}
+            for bbox, cid, conf in zip(d_xyxy.tolist(), d_class_id.astype(int).tolist(), confs)
+        ]
         return {"frame_number": frame_number, "objects": objects}
 
+    def _iter_predicted(self, batches: Iterable[_FrameBatch]) -> Iterator[tuple[_FrameBatch, list[sv.Detections]]]:
+        """Run one YOLO predict call per frame batch, yielding each batch with its per-frame detections."""
+        for batch in batches:
+            if batch.tensor is not None:
+                detections_batch = self._predict_gpu(batch.tensor)
+            elif self.gpu_preprocess and len({frame.shape for frame in batch.frames}) == 1:
+                # One upload per batch needs a single resolution (mixed-stream batches may not have one)
+                detections_batch = self._predict_gpu(self._upload(batch.frames))
+            else:
+                detections_batch = self._predict(batch.frames)
+            yield batch, detections_batch
+
+    def _iter_processed(
+        self,
+        predicted: Iterable[tuple[_FrameBatch, list[sv.Detections]]],
+        eval_mode: Literal["full", "model_only"],
+        vid_stride: int = 1,
+        annotate_workers: int = 4,
+        trackers: Sequence[sv.ByteTrack] | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any], Any]]:
+        """
+        Run per-frame tracking/annotation over a stream of predicted batches (from ``_iter_predicted``).
+
+        Args:
+            trackers: One tracker per stream, indexed by ``_FrameBatch.stream_ids`` (default: ``[self.tracker]``)
+
+        Yields:
+            (stream_id, frame_data, output_frame) per input frame, in order. ``frame_data`` is the JSON entry
+            for the frame; ``output_frame`` is the annotated frame (full) or the untouched input (model_only).
+            With ``vid_stride`` > 1 the batches hold every ``vid_stride``-th source frame and frame numbers
+            refer to the source video.
+        """
+        trackers = trackers if trackers is not None else [self.tracker]
+        next_frame_number: dict[int, int] = {}
+
+        def frame_numbers(batch: _FrameBatch) -> Iterator[tuple[int, int]]:
+            # (stream_id, frame_number) for every frame of the batch, counting per stream
+            for stream_id in batch.stream_ids or [0] * len(batch.frames):
+                frame_idx = next_frame_number.get(stream_id, 0)
+                next_frame_number[stream_id] = frame_idx + vid_stride
+                yield stream_id, frame_idx
+
+        if eval_mode == "model_only":
+            for batch, detections_batch in predicted:
+                for (stream_id, frame_idx), frame, detections in zip(
+                    frame_numbers(batch), batch.frames, detections_batch
+                ):
+                    yield stream_id, self._model_only_frame(detections, frame_idx), frame
+            return
+
+        with ThreadPoolExecutor(max_workers=annotate_workers) as pool:
+            for batch, detections_batch in predicted:
+                # Tracking stays strictly sequential per frame; drawing is independent per frame, so a
+                # batch's frames are annotated on the pool while the next frames are tracked
+                pending: list[tuple[int, dict[str, Any], Future[Any] | None]] = []
+                for (stream_id, frame_idx), frame, detections in zip(
+                    frame_numbers(batch), batch.frames, detections_batch
+                ):
+                    tracked_detections, ball_detections = self._track(detections, trackers[stream_id])
+                    frame_data = {
+                        "frame_number": frame_idx,
+                        **self._extract_detection_data(tracked_detections, ball_detections),
+                    }
+                    annotated = (
+                        pool.submit(self._annotate, frame, tracked_detections, ball_detections)
+                        if frame is not None
+                        else None
+                    )
+                    pending.append((stream_id, frame_data, annotated))
+                for stream_id, frame_data, annotated in pending:
+                    yield stream_id, frame_data, annotated.result() if annotated is not None else None
+
     def process_video(
         self,
         source_path: str,
@@ -230,6 +1046,11 @@ class VideoProcessor:
         json_path: str | None = None,
         eval_mode: Literal["full", "model_only"] = "full",
         write_video: bool = True,
+        batch_size: int = 16,
+        decoder_backend: Literal["opencv", "torchcodec", "decord"] = "opencv",
+        vid_stride: int = 1,
+        encoder: Literal["opencv", "ffmpeg", "pyav"] = "opencv",
+        annotate_workers: int = 4,
     ) -> str:
         """
         Process entire video and save annotated output.
@@ -237,67 +1058,183 @@ class VideoProcessor:
         Args:
             source_path: Path to input video
             target_path: Path to output video (unused if write_video=False; still used for default json name)
-            reset_tracker: Whether to reset tracker before processing (full mode only)
+            reset_tracker: Whether to start from a fresh tracker matched to the video's frame rate (full mode only)
             json_path: Optional path to save bounding box data as JSON.
                       If None, auto-generates from target_path (e.g., output.mp4 -> output_detections.json)
             eval_mode: \"full\" — pipeline with tracking and *_detections.json layout;
                        \"model_only\" — raw YOLO boxes in \"objects\" per frame (for ablation eval).
             write_video: If False, only write JSON (faster eval).
+            batch_size: Number of frames sent to YOLO per predict call (tracking still runs frame by frame)
+            decoder_backend: \"opencv\" — CPU decode; \"torchcodec\" / \"decord\" — NVDEC decode into GPU memory,
+                             frames go to YOLO without a host->device copy (falls back to opencv without the
+                             library/CUDA; decord must be built with CUDA)
+            vid_stride: Run inference on every Nth frame only. The JSON holds the processed frames (with their
+                        source frame numbers); the video repeats each annotated frame N times to keep its length.
+            encoder: "opencv" — ``sv.VideoSink``; "ffmpeg" — raw frames piped to ffmpeg (imageio-ffmpeg), encoded
+                     with h264_nvenc on the GPU when available, else libx264; \"pyav\" — same codecs, encoded
+                     in-process through PyAV
+            annotate_workers: Threads drawing annotations, several frames at a time (tracking stays sequential)
 
         Returns:
             Path to the written detections JSON file.
         """
-        if eval_mode == "full" and reset_tracker:
-            self.tracker.reset()
-
+        if vid_stride < 1:
+            raise ValueError(f"vid_stride must be >= 1, got {vid_stride}")
         # Auto-generate JSON path from target_path if not provided
         if json_path is None:
-            base_name = os.path.splitext(target_path)[0]
-            suffix = "_detections.json" if eval_mode == "full" else "_model_only_detections.json"
-            json_path = f"{base_name}{suffix}"
+            json_path = _default_json_path(target_path, eval_mode)
 
         video_info = sv.VideoInfo.from_video_path(source_path)
-        frame_generator = sv.get_video_frames_generator(source_path)
-
-        all_detections: list[dict[str, Any]] = []
-
-        if write_video and eval_mode == "full":
-            with sv.VideoSink(target_path, video_info=video_info) as video_sink:
-                for frame_idx, frame in enumerate(tqdm(frame_generator, total=video_info.total_frames)):
-                    annotated_frame, detection_data = self.process_frame(frame, return_detections=True)
-                    frame_data = {"frame_number": frame_idx, **detection_data}
-                    all_detections.append(frame_data)
-                    video_sink.write_frame(annotated_frame)
-        elif write_video and eval_mode == "model_only":
-            with sv.VideoSink(target_path, video_info=video_info) as video_sink:
-                for frame_idx, frame in enumerate(tqdm(frame_generator, total=video_info.total_frames)):
-                    det = self.process_frame_model_only(frame, frame_idx)
-                    all_detections.append(det)
-                    video_sink.write_frame(frame)
-        else:
-            for frame_idx, frame in enumerate(tqdm(frame_generator, total=video_info.total_frames)):
-                if eval_mode == "full":
-                    _, detection_data = self.process_frame(frame, return_detections=True)
-                    frame_data = {"frame_number": frame_idx, **detection_data}
-                    all_detections.append(frame_data)
-                else:
-                    all_detections.append(self.process_frame_model_only(frame, frame_idx))
-
-        output_data: dict[str, Any] = {
-            "video_info": {
-                "source_path": source_path,
-                "fps": video_info.fps,
-                "width": video_info.width,
-                "height": video_info.height,
-                "total_frames": video_info.total_frames,
-            },
-            "detections": all_detections,
-        }
-        if eval_mode == "model_only":
-            output_data["eval_mode"] = "model_only"
 
-        with open(json_path, "w") as f:
-            json.dump(output_data, f, indent=2)
+        if eval_mode == "full" and reset_tracker:
+            # A fresh tracker sized to the rate frames actually reach it: ByteTrack scales how long lost
+            # tracks are kept by frame_rate / 30, so a 60 fps or strided video needs the real value
+            self.tracker = sv.ByteTrack(frame_rate=max(1, round(video_info.fps / vid_stride)))
+
+        # Four overlapping stages, each on its own thread and joined by bounded queues:
+        # decode -> inference (model) -> tracking/annotation (tracker) -> write (this thread)
+        batch_queue_size = max(1, 32 // batch_size)
+        batches = _prefetch(
+            _iter_frame_batches(
+                source_path, batch_size, decoder_backend, host_frames=write_video, vid_stride=vid_stride
+            ),
+            maxsize=batch_queue_size,
+        )
+        predicted = _prefetch(self._iter_predicted(batches), maxsize=batch_queue_size)
+        processed = _prefetch(self._iter_processed(predicted, eval_mode, vid_stride, annotate_workers), maxsize=32)
+
+        footer = {"eval_mode": "model_only"} if eval_mode == "model_only" else None
+        sink = _open_video_sink(target_path, video_info, encoder) if write_video else contextlib.nullcontext()
+        total = video_info.total_frames
+        # Advanced once per batch from this (writer) thread only; redraws at most twice a second, and low
+        # smoothing keeps the rate estimate close to the recent speed
+        progress = tqdm(
+            total=-(-total // vid_stride) if total else None, mininterval=0.5, miniters=batch_size, smoothing=0.05
+        )
+        # Every stage is closed, upstream ones last, so an error anywhere also stops the decode and inference threads
+        with (
+            contextlib.closing(batches),
+            contextlib.closing(predicted),
+            sink as video_sink,
+            contextlib.closing(processed),
+            # Opened last so nothing leaks if the sink fails; only a clean exit publishes the JSON
+            _DetectionJsonWriter(json_path, _json_header(source_path, video_info), footer) as json_writer,
+            progress,
+        ):
+            done = 0
+            for _, frame_data, output_frame in processed:
+                json_writer.append(frame_data)
+                if video_sink is not None:
+                    # Hold each annotated frame for the skipped ones so the output keeps the source length
+                    remaining = total - frame_data["frame_number"] if total else vid_stride
+                    for _ in range(max(1, min(vid_stride, remaining))):
+                        video_sink.write_frame(output_frame)
+                done += 1
+                if done == batch_size:
+                    progress.update(done)
+                    done = 0
+            progress.update(done)
 
         print(f"📊 Detection data saved to: {json_path}")
         return str(json_path)
+
+    def process_streams(
+        self,
+        source_paths: Sequence[str],
+        target_paths: Sequence[str],
+        json_paths: Sequence[str | None] | None = None,
+        eval_mode: Literal["full", "model_only"] = "full",
+        write_video: bool = True,
+        batch_size: int = 16,
+        encoder: Literal["opencv", "ffmpeg", "pyav"] = "opencv",
+        annotate_workers: int = 4,
+    ) -> list[str]:
+        """
+        Process several videos with this one model, batching frames across videos into shared predict calls.
+
+        Frames are taken from the videos in turn, so a batch mixes streams and the GPU stays busy without
+        loading the model once per video. Each video keeps its own ByteTrack tracker, output video and
+        detections JSON, identical in layout to ``process_video``'s.
+
+        Args:
+            source_paths: Input videos
+            target_paths: Output video per input (unused if write_video=False; still used for default json names)
+            json_paths: Optional detections JSON path per input (None entries auto-generate from target_paths)
+            eval_mode: \"full\" or \"model_only\", as in ``process_video``
+            write_video: If False, only write JSON
+            batch_size: Frames (from any of the videos) sent to YOLO per predict call
+            encoder: Video writer backend, as in ``process_video``
+            annotate_workers: Threads drawing annotations, as in ``process_video``
+
+        Returns:
+            Paths to the written detections JSON files, in input order.
+        """
+        if len(target_paths) != len(source_paths):
+            raise ValueError(f"Got {len(source_paths)} sources but {len(target_paths)} targets")
+        json_paths = list(json_paths) if json_paths is not None else [None] * len(source_paths)
+        if len(json_paths) != len(source_paths):
+            raise ValueError(f"Got {len(source_paths)} sources but {len(json_paths)} json_paths")
+        resolved_json_paths = [
+            json_path or _default_json_path(target_path, eval_mode)
+            for json_path, target_path in zip(json_paths, target_paths)
+        ]
+
+        video_infos = [sv.VideoInfo.from_video_path(source_path) for source_path in source_paths]
+        # One tracker per video: each counts its own track IDs from 1
+        trackers = [sv.ByteTrack(frame_rate=max(1, round(video_info.fps))) for video_info in video_infos]
+        footer = {"eval_mode": "model_only"} if eval_mode == "model_only" else None
+
+        with contextlib.ExitStack() as stack:
+            # Same stages as process_video, with one decode thread per video feeding the shared batches
+            streams = [
+                stack.enter_context(contextlib.closing(_prefetch(sv.get_video_frames_generator(path), batch_size)))
+                for path in source_paths
+            ]
+            sinks: list[sv.VideoSink | _FfmpegVideoSink | _PyAVVideoSink | None] = []
+            for target_path, video_info in zip(target_paths, video_infos):
+                sink = _open_video_sink(target_path, video_info, encoder) if write_video else None
+                if sink is not None:
+                    stack.enter_context(sink)
+                sinks.append(sink)
+            json_writers = [
+                stack.enter_context(_DetectionJsonWriter(json_path, _json_header(source_path, video_info), footer))
+                for json_path, source_path, video_info in zip(resolved_json_paths, source_paths, video_infos)
+            ]
+            batch_queue_size = max(1, 32 // batch_size)
+            # Upstream stages are entered first so they are closed after (and stopped along with) processed
+            batches = stack.enter_context(
+                contextlib.closing(_prefetch(_interleave_batches(streams, batch_size), maxsize=batch_queue_size))
+            )
+            predicted = stack.enter_context(
+                contextlib.closing(_prefetch(self._iter_predicted(batches), maxsize=batch_queue_size))
+            )
+            processed = stack.enter_context(
+                contextlib.closing(
+                    _prefetch(
+                        self._iter_processed(
+                            predicted, eval_mode, annotate_workers=annotate_workers, trackers=trackers
+                        ),
+                        maxsize=32,
+                    )
+                )
+            )
+            total = sum(video_info.total_frames or 0 for video_info in video_infos)
+            progress = stack.enter_context(
+                tqdm(total=total or None, mininterval=0.5, miniters=batch_size, smoothing=0.05)
+            )
+
+            done = 0
+            for stream_id, frame_data, output_frame in processed:
+                json_writers[stream_id].append(frame_data)
+                stream_sink = sinks[stream_id]
+                if stream_sink is not None:
+                    stream_sink.write_frame(output_frame)
+                done += 1
+                if done == batch_size:
+                    progress.update(done)
+                    done = 0
+            progress.update(done)
+
+        for json_path in resolved_json_paths:
+            print(f"📊 Detection data saved to: {json_path}")
+        return resolved_json_paths
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from ultralytics import YOLO
@@ -58,23 +59,25 @@ def train_model(
         "plots": plots,
     }
 
-    # Add optional training parameters if provided
-    if freeze is not None:
-        train_args["freeze"] = freeze
-    if lr0 is not None:
-        train_args["lr0"] = lr0
-    if lrf is not None:
-        train_args["lrf"] = lrf
+    # Add optional training parameters if provided (None keeps the ultralytics default)
+    optional_args = {"freeze": freeze, "lr0": lr0, "lrf": lrf}
+    train_args.update({key: value for key, value in optional_args.items() if value is not None})
 
     model.train(**train_args)
 
     # Return path to results (best model will be in weights/best.pt)
-    if name:
-        results_path = Path(project) / name
-    else:
-        # Find the latest run
-        project_path = Path(project)
-        runs = sorted(project_path.glob("*/"), key=lambda x: x.stat().st_mtime, reverse=True)
-        results_path = runs[0] if runs else project_path
+    results_path = Path(project) / name if name else _latest_run(Path(project))
 
     return str(results_path)
+
+
+def _latest_run(project_path: Path) -> Path:
+    """Most recently modified run directory in ``project_path`` (``project_path`` itself if there are none)."""
+    if not project_path.is_dir():
+        return project_path
+    # One scandir pass: DirEntry caches the file type, and max() avoids sorting every run
+    with os.scandir(project_path) as entries:
+        latest = max(
+            (e for e in entries if e.is_dir(follow_symlinks=False)), key=lambda e: e.stat().st_mtime, default=None
+        )
+    return Path(latest.path) if latest else project_path
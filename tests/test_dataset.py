@@ -106,3 +106,43 @@ class TestRemapLabels:
         lines = content.strip().split("\n")
         assert len(lines) == 1
         assert lines[0].startswith("1 ")  # class 6 -> 1
+
+    def test_preserves_coordinates(self, tmp_labels):
+        class_map = {4: 0, 6: 1, 11: 2, 16: 3}
+        remap_labels(str(tmp_labels / "labels"), class_map)
+
+        content = (tmp_labels / "labels" / "img1.txt").read_text()
+        coords = [float(v) for v in content.split("\n")[1].split()[1:]]
+        assert coords == [0.3, 0.3, 0.2, 0.2]
+
+    def test_removes_empty_files(self, tmp_labels):
+        (tmp_labels / "labels" / "img4.txt").write_text("")
+        (tmp_labels / "images" / "img4.jpg").touch()
+
+        remapped, removed = remap_labels(str(tmp_labels / "labels"), {4: 0, 6: 1, 11: 2, 16: 3})
+
+        assert (remapped, removed) == (2, 2)
+        assert not (tmp_labels / "images" / "img4.jpg").exists()
+
+    def test_ragged_rows_fall_back_to_line_parsing(self, tmp_labels):
+        (tmp_labels / "labels" / "img4.txt").write_text("11 0.1 0.1 0.2 0.1 0.2 0.2\n4 0.5 0.5 0.1 0.1\n")
+
+        remap_labels(str(tmp_labels / "labels"), {4: 0, 6: 1, 11: 2, 16: 3})
+
+        lines = (tmp_labels / "labels" / "img4.txt").read_text().strip().split("\n")
+        assert lines == ["2 0.1 0.1 0.2 0.1 0.2 0.2", "0 0.5 0.5 0.1 0.1"]
+
+    def test_parallel_matches_serial(self, tmp_path):
+        class_map = {4: 0, 6: 1, 11: 2, 16: 3}
+        for name in ("serial", "parallel"):
+            label_dir = tmp_path / name / "labels"
+            label_dir.mkdir(parents=True)
+            for i in range(150):
+                cls = 99 if i % 10 == 0 else 11
+                (label_dir / f"img{i}.txt").write_text(f"{cls} 0.5 0.5 0.1 0.1\n")
+
+        serial = remap_labels(str(tmp_path / "serial" / "labels"), class_map, workers=1)
+        parallel = remap_labels(str(tmp_path / "parallel" / "labels"), class_map, workers=2)
+
+        assert serial == parallel == (135, 15)
+        assert (tmp_path / "parallel" / "labels" / "img1.txt").read_text().startswith("2 ")
@@ -1,8 +1,9 @@
 """Tests for dataset merger utilities."""
 
 import pytest
+import yaml
 
-from src.data.dataset_merger import _extract_ball_annotations
+from src.data.dataset_merger import _extract_ball_annotations, _place_file, merge_datasets
 
 
 @pytest.fixture
@@ -13,6 +14,74 @@ def label_file(tmp_path):
     return path
 
 
+@pytest.fixture
+def datasets(tmp_path):
+    """Create a small primary (4-class) dataset and a ball-only dataset."""
+    primary = tmp_path / "primary"
+    for split, n in [("train", 6), ("val", 2), ("test", 2)]:
+        (primary / split / "images").mkdir(parents=True)
+        (primary / split / "labels").mkdir(parents=True)
+        for i in range(n):
+            (primary / split / "images" / f"{split}{i}.jpg").write_bytes(b"jpg")
+            if i > 0:  # first image of each split is unlabeled
+                (primary / split / "labels" / f"{split}{i}.txt").write_text("2 0.5 0.5 0.1 0.2\n")
+
+    ball_only = tmp_path / "ball_only"
+    (ball_only / "images").mkdir(parents=True)
+    (ball_only / "labels").mkdir(parents=True)
+    for i in range(3):
+        (ball_only / "images" / f"ball{i}.jpg").write_bytes(b"jpg")
+        (ball_only / "labels" / f"ball{i}.txt").write_text("7 0.4 0.4 0.02 0.02\n")
+
+    return primary, ball_only, tmp_path / "merged"
+
+
+class TestMergeDatasets:
+    def test_merges_images_and_labels(self, datasets):
+        primary, ball_only, out = datasets
+
+        merge_datasets(str(primary), str(ball_only), str(out), max_ball_only_ratio=1.0)
+
+        images = list(out.glob("*/images/*"))
+        labels = list(out.glob("*/labels/*"))
+        assert len(images) == 13
+        assert len(labels) == 10  # 7 primary labels + 3 ball-only labels
+        assert (out / "train" / "labels" / "train1.txt").read_text() == "2 0.5 0.5 0.1 0.2\n"
+        ball_labels = [p.read_text() for p in out.glob("*/labels/ball*.txt")]
+        assert ball_labels == ["0 0.4 0.4 0.02 0.02\n"] * 3
+
+        data = yaml.safe_load((out / "data.yaml").read_text())
+        assert data["nc"] == 4
+
+    def test_finds_all_image_extensions_once(self, datasets):
+        primary, ball_only, out = datasets
+        (ball_only / "images" / "ball0.jpg").rename(ball_only / "images" / "ball0.JPEG")
+        (ball_only / "images" / "ball1.jpg").rename(ball_only / "images" / "ball1.png")
+
+        merge_datasets(str(primary), str(ball_only), str(out), max_ball_only_ratio=1.0)
+
+        ball_images = sorted(p.name for p in out.glob("*/images/ball*"))
+        assert ball_images == ["ball0.JPEG", "ball1.png", "ball2.jpg"]
+
+    def test_png_only_dataset(self, datasets):
+        primary, ball_only, out = datasets
+        for img in (ball_only / "images").iterdir():
+            img.rename(img.with_suffix(".png"))
+
+        merge_datasets(str(primary), str(ball_only), str(out), max_ball_only_ratio=1.0)
+
+        assert len(list(out.glob("*/images/ball*.png"))) == 3
+
+    @pytest.mark.parametrize("link_mode", ["hardlink", "copy"])
+    def test_link_mode(self, datasets, link_mode):
+        primary, ball_only, out = datasets
+
+        merge_datasets(str(primary), str(ball_only), str(out), max_ball_only_ratio=1.0, link_mode=link_mode)
+
+        merged = out / "train" / "images" / "train0.jpg"
+        assert merged.samefile(primary / "train" / "images" / "train0.jpg") == (link_mode == "hardlink")
+
+
 class TestExtractBallAnnotations:
     def test_maps_all_annotations_to_ball_class(self, label_file):
         annotations = _extract_ball_annotations(label_file, ball_class_id=0)
@@ -43,3 +112,55 @@ class TestExtractBallAnnotations:
         path.write_text("")
         result = _extract_ball_annotations(path, ball_class_id=0)
         assert result == []
+
+
+class TestPlaceFile:
+    @pytest.mark.parametrize("link_mode", ["hardlink", "reflink", "copy"])
+    def test_places_identical_content(self, tmp_path, link_mode):
+        src = tmp_path / "src.jpg"
+        src.write_bytes(b"image-bytes")
+        dst = tmp_path / "dst.jpg"
+
+        _place_file(src, dst, link_mode)
+
+        assert dst.read_bytes() == b"image-bytes"
+
+    def test_hardlink_shares_inode(self, tmp_path):
+        src = tmp_path / "src.jpg"
+        src.write_bytes(b"image-bytes")
+        dst = tmp_path / "dst.jpg"
+
+        _place_file(src, dst, "hardlink")
+
+        assert dst.samefile(src)
+
+    @pytest.mark.parametrize("link_mode", ["hardlink", "reflink", "copy"])
+    def test_replacing_existing_link_keeps_source(self, tmp_path, link_mode):
+        src = tmp_path / "src.jpg"
+        src.write_bytes(b"image-bytes")
+        dst = tmp_path / "dst.jpg"
+        _place_file(src, dst, "hardlink")
+
+        _place_file(src, dst, link_mode)
+
+        assert src.read_bytes() == b"image-bytes"
+        assert dst.read_bytes() == b"image-bytes"
+
+    @pytest.mark.parametrize("link_mode", ["hardlink", "reflink", "copy"])
+    def test_dst_is_src_keeps_file(self, tmp_path, link_mode):
+        path = tmp_path / "img.jpg"
+        path.write_bytes(b"image-bytes")
+
+        _place_file(path, path, link_mode)
+
+        assert path.read_bytes() == b"image-bytes"
+
+    def test_replaces_unrelated_existing_file(self, tmp_path):
+        src = tmp_path / "src.jpg"
+        src.write_bytes(b"image-bytes")
+        dst = tmp_path / "dst.jpg"
+        dst.write_bytes(b"stale")
+
+        _place_file(src, dst, "copy")
+
+        assert dst.read_bytes() == b"image-bytes"
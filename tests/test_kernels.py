@@ -0,0 +1,50 @@
+"""Tests for the per-frame inference kernels."""
+
+import numpy as np
+import pytest
+
+from src.inference import _kernels
+from src.inference._kernels import split_by_class
+
+BALL = 0
+
+
+@pytest.fixture
+def numpy_fallback(monkeypatch):
+    """Force the numpy path, as when Numba is not installed."""
+    monkeypatch.setattr(_kernels, "_split_by_class_jit", None)
+
+
+def _expected(class_id, confidence, ball_conf, player_conf):
+    ball = [i for i, (c, p) in enumerate(zip(class_id, confidence)) if c == BALL and p >= ball_conf]
+    other = [i for i, (c, p) in enumerate(zip(class_id, confidence)) if c != BALL and p >= player_conf]
+    return ball, other
+
+
+CASES = {
+    "mixed": (np.array([0, 1, 2, 0, 3, 1]), np.array([0.05, 0.9, 0.3, 0.5, 0.4, 0.41], dtype=np.float32)),
+    "nan": (np.array([0, 1, 0, 2]), np.array([np.nan, np.nan, 0.2, 0.8], dtype=np.float32)),
+    "empty": (np.array([], dtype=np.int64), np.array([], dtype=np.float32)),
+    # What VideoProcessor._track passes when detections carry no confidences
+    "no_confidence": (np.array([1, 0, 2]), np.full(3, np.inf)),
+    "ball_only": (np.array([0, 0, 0]), np.array([0.1, 0.09, 0.7], dtype=np.float32)),
+}
+
+
+class TestSplitByClass:
+    @pytest.mark.parametrize("case", CASES)
+    def test_numpy_fallback(self, numpy_fallback, case):
+        class_id, confidence = CASES[case]
+        ball_idx, other_idx = split_by_class(class_id, confidence, BALL, 0.1, 0.4)
+        assert (ball_idx.tolist(), other_idx.tolist()) == _expected(class_id, confidence, 0.1, 0.4)
+
+    @pytest.mark.parametrize("case", CASES)
+    def test_numba_matches_numpy(self, monkeypatch, case):
+        pytest.importorskip("numba")
+        class_id, confidence = CASES[case]
+        compiled = split_by_class(class_id, confidence, BALL, 0.1, 0.4)
+        monkeypatch.setattr(_kernels, "_split_by_class_jit", None)
+        fallback = split_by_class(class_id, confidence, BALL, 0.1, 0.4)
+        for got, want in zip(compiled, fallback):
+            assert got.dtype == want.dtype
+            assert got.tolist() == want.tolist()
@@ -0,0 +1,358 @@
+"""Tests for video processing helpers."""
+
+import itertools
+import json
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+sv = pytest.importorskip("supervision")
+cv2 = pytest.importorskip("cv2")
+
+from src.inference.video_processor import (  # noqa: E402
+    AnnotatorConfig,
+    VideoProcessor,
+    _batched,
+    _class_remap,
+    _DetectionJsonWriter,
+    _interleave_batches,
+    _letterbox_gpu,
+    _prefetch,
+    _unletterbox,
+)
+
+# Clip frames are filled with index * STEP, so a decoded frame's mean tells which source frame it is
+STEP = 20
+
+HEADER = {
+    "video_info": {"source_path": "match.mp4", "fps": 25.0, "width": 1280, "height": 720, "total_frames": 9},
+}
+
+
+def _frames(count):
+    """Detections JSON entries shaped like the full pipeline's."""
+    return [
+        {
+            "frame_number": i,
+            "tracked_objects": [{"bbox": [1.5 * i, 2.0, 3.0, 4.0], "class_id": i % 3, "tracker_id": i + 1}],
+            "ball": [],
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson, then with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        # A None entry makes `import orjson` raise ImportError
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    return request.param
+
+
+def _write(path, header, frames, footer=None, flush_every=4):
+    writer = _DetectionJsonWriter(str(path), header, footer, flush_every=flush_every)
+    for frame in frames:
+        writer.append(frame)
+    writer.close()
+    with open(path) as f:
+        return json.load(f)
+
+
+class TestDetectionJsonWriter:
+    @pytest.mark.parametrize("count", [0, 1, 4, 9])
+    @pytest.mark.parametrize("footer", [None, {"eval_mode": "model_only"}])
+    def test_matches_single_dump(self, tmp_path, encoder, count, footer):
+        frames = _frames(count)
+        data = _write(tmp_path / "detections.json", HEADER, frames, footer)
+        assert data == {**HEADER, "detections": frames, **(footer or {})}
+
+    def test_empty_header(self, tmp_path, encoder):
+        frames = _frames(2)
+        assert _write(tmp_path / "detections.json", {}, frames) == {"detections": frames}
+
+    def test_numpy_values(self, tmp_path, encoder):
+        frame = {
+            "frame_number": 0,
+            "objects": [
+                {"bbox": np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32), "class_id": np.int64(2), "confidence": 0.5}
+            ],
+        }
+        data = _write(tmp_path / "detections.json", HEADER, [frame])
+        assert data["detections"] == [
+            {"frame_number": 0, "objects": [{"bbox": [1.0, 2.0, 3.0, 4.0], "class_id": 2, "confidence": 0.5}]}
+        ]
+
+    def test_published_only_on_close(self, tmp_path, encoder):
+        path = tmp_path / "detections.json"
+        writer = _DetectionJsonWriter(str(path), HEADER, flush_every=1)
+        writer.append(_frames(1)[0])
+        assert not path.exists()
+        writer.close()
+        assert [p.name for p in tmp_path.iterdir()] == ["detections.json"]
+
+    def test_exception_discards_partial_file(self, tmp_path, encoder):
+        path = tmp_path / "detections.json"
+        path.write_text('{"detections": []}')  # output of an earlier run
+        with pytest.raises(RuntimeError), _DetectionJsonWriter(str(path), HEADER, flush_every=2) as writer:
+            for frame in _frames(5):
+                writer.append(frame)
+            raise RuntimeError("boom")
+        assert [p.name for p in tmp_path.iterdir()] == ["detections.json"]
+        assert json.loads(path.read_text()) == {"detections": []}
+
+
+class _StubYOLO:
+    """Stands in for ``ultralytics.YOLO``; tests replace ``VideoProcessor._predict``, so it never predicts."""
+
+    names = {0: "ball", 1: "goalkeeper", 2: "player", 3: "referee"}
+    overrides = {"imgsz": 640}
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+
+def _frame_index(frame):
+    return round(float(frame.mean()) / STEP)
+
+
+def _stub_detections(frame):
+    """One player whose x1 encodes the source frame index."""
+    return sv.Detections(
+        xyxy=np.array([[10.0 + _frame_index(frame), 10.0, 40.0, 50.0]]),
+        confidence=np.array([0.9]),
+        class_id=np.array([2]),
+    )
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ultralytics", types.SimpleNamespace(YOLO=_StubYOLO))
+    vp = VideoProcessor("stub.pt", warmup_runs=0)
+    monkeypatch.setattr(vp, "_predict", lambda frames: [_stub_detections(frame) for frame in frames])
+    return vp
+
+
+def _write_clip(path, count, size=(96, 64), fps=10, first=0):
+    """Clip whose frame i is filled with (first + i) * STEP."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    for i in range(first, first + count):
+        writer.write(np.full((size[1], size[0], 3), i * STEP, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def _frame_indices(path):
+    """Source frame index of every frame of a written video."""
+    return [_frame_index(frame) for frame in sv.get_video_frames_generator(str(path))]
+
+
+class TestBatched:
+    def test_groups_with_short_last_batch(self):
+        assert list(_batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_empty(self):
+        assert list(_batched([], 4)) == []
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            list(_batched(range(3), 0))
+
+
+class TestPrefetch:
+    def test_preserves_order(self):
+        assert list(_prefetch(range(100), maxsize=3)) == list(range(100))
+
+    def test_reraises_producer_error(self):
+        def source():
+            yield 1
+            raise ValueError("decode failed")
+
+        items = _prefetch(source(), maxsize=2)
+        assert next(items) == 1
+        with pytest.raises(ValueError, match="decode failed"):
+            next(items)
+
+    def test_close_stops_producer(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                yield from itertools.count()
+            finally:
+                closed.set()
+
+        before = threading.active_count()
+        items = _prefetch(source(), maxsize=2)
+        assert [next(items), next(items)] == [0, 1]
+        items.close()
+        assert closed.is_set()
+        assert threading.active_count() == before
+
+
+class TestLetterbox:
+    def test_unletterbox_maps_back_and_clips(self):
+        # 1280x720 letterboxed to 640: gain 0.5, 140 rows of padding above
+        detections = sv.Detections(xyxy=np.array([[50.0, 240.0, 150.0, 340.0], [-10.0, 100.0, 700.0, 600.0]]))
+        _unletterbox(detections, 0.5, (0, 140), (720, 1280))
+        np.testing.assert_allclose(detections.xyxy, [[100, 200, 300, 400], [0, 0, 1280, 720]])
+
+    @pytest.mark.parametrize("shape", [(720, 1280), (1280, 720), (640, 640)])
+    def test_letterbox_round_trip(self, shape):
+        torch = pytest.importorskip("torch")
+        height, width = shape
+        x, gain, (pad_x, pad_y) = _letterbox_gpu(torch.full((2, 3, height, width), 255, dtype=torch.uint8), 640)
+
+        assert x.shape == (2, 3, 640, 640)
+        assert gain == min(640 / height, 640 / width)
+        # Image centred, gray padding around it
+        assert torch.all(x[:, :, pad_y : 640 - pad_y, pad_x : 640 - pad_x] == 1)
+        if pad_y:
+            assert torch.allclose(x[:, :, :pad_y], torch.tensor(114 / 255))
+
+        source = np.array([[100.0, 200.0, 300.0, 400.0]])
+        detections = sv.Detections(xyxy=source * gain + (pad_x, pad_y, pad_x, pad_y))
+        _unletterbox(detections, gain, (pad_x, pad_y), shape)
+        np.testing.assert_allclose(detections.xyxy, source)
+
+
+class TestClassRemap:
+    def test_four_class_model(self):
+        remap = _class_remap(types.SimpleNamespace(names=_StubYOLO.names), ball_class_id=0)
+        assert remap.tolist() == [-1, 0, 1, 2]
+
+    def test_ball_not_first(self):
+        remap = _class_remap(types.SimpleNamespace(names={0: "gk", 1: "player", 2: "ref", 3: "ball"}), 3)
+        assert remap.tolist() == [0, 1, 2, -1]
+
+    def test_sparse_class_ids(self):
+        remap = _class_remap(types.SimpleNamespace(names={0: "gk", 2: "ball", 5: "ref"}), 2)
+        assert remap.tolist() == [0, -1, -1, -1, -1, 1]
+
+    def test_no_names(self):
+        assert _class_remap(types.SimpleNamespace(), 0) is None
+
+
+class TestAnnotatorConfig:
+    def test_none_colors_use_defaults(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "ultralytics", types.SimpleNamespace(YOLO=_StubYOLO))
+        config = AnnotatorConfig(ellipse_colors=None, label_colors=None)
+        vp = VideoProcessor("stub.pt", config=config, warmup_runs=0)
+        default = VideoProcessor("stub.pt", warmup_runs=0)
+        assert vp.ellipse_annotator.color.colors == default.ellipse_annotator.color.colors
+        assert vp.label_annotator.color.colors == default.label_annotator.color.colors
+
+
+class TestProcessVideo:
+    def test_frames_stay_aligned_across_batches(self, tmp_path, processor):
+        source = _write_clip(tmp_path / "in.mp4", 7)
+        json_path = processor.process_video(source, str(tmp_path / "out.mp4"), eval_mode="model_only", batch_size=3)
+        with open(json_path) as f:
+            detections = json.load(f)["detections"]
+        assert [frame["frame_number"] for frame in detections] == list(range(7))
+        assert [frame["objects"][0]["bbox"][0] - 10 for frame in detections] == list(range(7))
+        assert _frame_indices(tmp_path / "out.mp4") == list(range(7))
+
+    def test_vid_stride_numbers_and_repeats_frames(self, tmp_path, processor):
+        source = _write_clip(tmp_path / "in.mp4", 10)
+        json_path = processor.process_video(
+            source, str(tmp_path / "out.mp4"), eval_mode="model_only", batch_size=2, vid_stride=3
+        )
+        with open(json_path) as f:
+            detections = json.load(f)["detections"]
+        # Every 3rd source frame is processed and keeps its source frame number
+        assert [frame["frame_number"] for frame in detections] == [0, 3, 6, 9]
+        assert [frame["objects"][0]["bbox"][0] - 10 for frame in detections] == [0, 3, 6, 9]
+        # The video keeps the source length, holding each processed frame over the skipped ones
+        assert _frame_indices(tmp_path / "out.mp4") == [0, 0, 0, 3, 3, 3, 6, 6, 6, 9]
+
+    def test_full_mode_tracks_every_frame(self, tmp_path, processor):
+        source = _write_clip(tmp_path / "in.mp4", 5)
+        json_path = processor.process_video(source, str(tmp_path / "out.mp4"), write_video=False, batch_size=2)
+        with open(json_path) as f:
+            detections = json.load(f)["detections"]
+        assert [frame["frame_number"] for frame in detections] == list(range(5))
+        assert {obj["tracker_id"] for frame in detections for obj in frame["tracked_objects"]} == {1}
+
+    def test_track_ids_restart_for_each_video(self, tmp_path, processor):
+        source = _write_clip(tmp_path / "in.mp4", 3)
+        for run in range(2):
+            json_path = processor.process_video(source, str(tmp_path / f"out{run}.mp4"), write_video=False)
+            with open(json_path) as f:
+                detections = json.load(f)["detections"]
+            assert {obj["tracker_id"] for frame in detections for obj in frame["tracked_objects"]} == {1}
+
+
+class TestInterleaveBatches:
+    def test_unequal_streams(self):
+        batches = list(_interleave_batches([iter(["a0", "a1", "a2"]), iter(["b0"])], batch_size=3))
+        assert [(batch.frames, batch.stream_ids) for batch in batches] == [
+            (["a0", "b0", "a1"], [0, 1, 0]),
+            (["a2"], [0]),  # short final batch
+        ]
+
+    def test_round_robin_keeps_each_stream_in_order(self):
+        streams = [iter(range(0, 5)), iter(range(10, 12)), iter(range(20, 24))]
+        batches = list(_interleave_batches(streams, batch_size=4))
+        frames = [frame for batch in batches for frame in batch.frames]
+        stream_ids = [stream_id for batch in batches for stream_id in batch.stream_ids]
+        assert frames == [0, 10, 20, 1, 11, 21, 2, 22, 3, 23, 4]
+        assert stream_ids == [0, 1, 2, 0, 1, 2, 0, 2, 0, 2, 0]
+        assert [len(batch.frames) for batch in batches] == [4, 4, 3]
+
+    def test_no_streams(self):
+        assert list(_interleave_batches([], batch_size=4)) == []
+
+
+class TestProcessStreams:
+    @pytest.fixture
+    def clips(self, tmp_path):
+        # Distinct fill values per clip, so every frame's detections say which video and frame they came from
+        return [_write_clip(tmp_path / "a.mp4", 7), _write_clip(tmp_path / "b.mp4", 3, first=10)]
+
+    def test_model_only_outputs_per_stream(self, tmp_path, processor, clips):
+        targets = [str(tmp_path / "a_out.mp4"), str(tmp_path / "b_out.mp4")]
+        json_paths = processor.process_streams(clips, targets, eval_mode="model_only", batch_size=4)
+
+        for json_path, target, first, count in zip(json_paths, targets, (0, 10), (7, 3)):
+            with open(json_path) as f:
+                detections = json.load(f)["detections"]
+            assert [frame["frame_number"] for frame in detections] == list(range(count))
+            assert [frame["objects"][0]["bbox"][0] - 10 for frame in detections] == list(range(first, first + count))
+            assert _frame_indices(target) == list(range(first, first + count))
+
+    def test_each_stream_has_its_own_tracker(self, tmp_path, processor, clips, monkeypatch):
+        routed = []
+        track = processor._track
+
+        def spy(detections, tracker):
+            routed.append((round(detections.xyxy[0, 0]) - 10, tracker))
+            return track(detections, tracker)
+
+        monkeypatch.setattr(processor, "_track", spy)
+        targets = [str(tmp_path / "a_out.mp4"), str(tmp_path / "b_out.mp4")]
+        json_paths = processor.process_streams(clips, targets, write_video=False, batch_size=4)
+
+        # Frames reach the trackers in order within each video, and each video uses one tracker of its own
+        assert [index for index, _ in routed if index < 10] == list(range(7))
+        assert [index for index, _ in routed if index >= 10] == [10, 11, 12]
+        trackers_a = {id(tracker) for index, tracker in routed if index < 10}
+        trackers_b = {id(tracker) for index, tracker in routed if index >= 10}
+        assert len(trackers_a) == len(trackers_b) == 1
+        assert trackers_a != trackers_b
+        for json_path, count in zip(json_paths, (7, 3)):
+            with open(json_path) as f:
+                detections = json.load(f)["detections"]
+            assert [frame["frame_number"] for frame in detections] == list(range(count))
+            assert {obj["tracker_id"] for frame in detections for obj in frame["tracked_objects"]} == {1}
+
+    def test_rejects_mismatched_paths(self, tmp_path, processor, clips):
+        with pytest.raises(ValueError):
+            processor.process_streams(clips, [str(tmp_path / "a_out.mp4")])
+        with pytest.raises(ValueError):
+            processor.process_streams(clips, [str(tmp_path / "x.mp4")] * 2, json_paths=[str(tmp_path / "x.json")])